@@ -3,6 +3,8 @@ import logging
 import os
 import time
 from datetime import datetime
+from pathlib import Path
+from typing import Tuple
 
 import discord
 import yaml
@@ -12,12 +14,18 @@ from src.bot.helper import BotHelper
 from src.config.cliargs import CLIArgs
 from src.utils.commandline import CommandLine
 from src.utils.pdf_generator import pdf_generator
-from src.utils.session_recorder import SessionRecorder
+from src.sinks.session_recorder import SessionRecorder
 from src.sinks.recording_sink import RecordingSink
 # US3: Async transcription imports
 from src.transcription.job_manager import TranscriptionJobManager
 from src.transcription.task_queue import TranscriptionTaskQueue
 from src.transcription.transcription_service import TranscriptionService
+from src.config.transcription_config import TranscriptionConfig
+
+try:
+    import uvloop
+except ImportError:  # uvloop does not support Windows
+    uvloop = None
 
 load_dotenv()
 DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
@@ -25,6 +33,14 @@ PLAYER_MAP_FILE_PATH = os.getenv("PLAYER_MAP_FILE_PATH")
 
 logger = logging.getLogger()  # root logger
 
+SESSIONS_DIR = Path("Sessions")
+
+
+def session_paths(guild_id: int) -> Tuple[Path, Path]:
+    """Return the (audio, metadata) paths saved for a guild's recorded session."""
+    session_dir = SESSIONS_DIR / str(guild_id)
+    return session_dir / "session_audio_16k.wav", session_dir / "metadata.json"
+
 
 def configure_logging():
     logging.getLogger('discord').setLevel(logging.WARNING)
@@ -80,15 +96,18 @@ if __name__ == "__main__":
     CLIArgs.update_from_args(args)
 
     configure_logging()
-    loop = asyncio.get_event_loop()
+    # Create the bot's loop once up front; everything else reuses bot.loop
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
 
     from src.bot.volo_bot import VoloBot
     bot = VoloBot(loop)
 
     # US3: Async transcription job manager and queue
-    job_manager = TranscriptionJobManager(max_workers=4)
-    task_queue = TranscriptionTaskQueue()
-    transcription_service = TranscriptionService()
+    job_manager = TranscriptionJobManager(max_workers=1)
+    # Model, compute type, batch size and diarization options come from the TRANSCRIPTION_* env vars
+    transcription_service = TranscriptionService(**TranscriptionConfig().as_dict())
+    task_queue = TranscriptionTaskQueue(transcription_service)
 
     @bot.slash_command(name="transcribe_async", description="Run transcription in the background (async)")
     async def transcribe_async(ctx: discord.context.ApplicationContext):
@@ -98,12 +117,13 @@ if __name__ == "__main__":
             await ctx.respond("Not connected to a voice channel.", ephemeral=True)
             return
         # Assume session_audio_16k.wav and metadata.json are saved in a known location
-        audio_path = f"Sessions/{guild_id}/session_audio_16k.wav"
-        metadata_path = f"Sessions/{guild_id}/metadata.json"
+        audio_path, metadata_path = session_paths(guild_id)
         job_id = f"transcribe_{guild_id}_{int(time.time())}"
 
         async def run_transcription_job():
-            result = await transcription_service.transcribe_audio(Path(audio_path), Path(metadata_path))
+            # Queue behind other guilds' jobs on the shared transcription worker
+            queued = await task_queue.submit(job_id, audio_path, metadata_path)
+            result = await queued
             # Notify user when done
             channel = ctx.channel
             if result.get("error"):
@@ -111,8 +131,8 @@ if __name__ == "__main__":
             else:
                 await channel.send(f"✅ Transcription complete! Transcript: {result['transcript_path']}")
 
-        # Submit job to job manager
-        future = job_manager.submit_job(job_id, lambda: asyncio.run(run_transcription_job()))
+        # Submit job to job manager on the running (bot) event loop
+        future = job_manager.submit_job(job_id, run_transcription_job())
         await ctx.respond(f"Transcription started in background. Job ID: {job_id}", ephemeral=True)
 
     @bot.slash_command(name="transcription_status", description="Check status of async transcription job")
@@ -126,10 +146,11 @@ if __name__ == "__main__":
         if not future:
             await ctx.respond(f"No such job: {job_id}", ephemeral=True)
             return
-        while not future.done():
-            await asyncio.sleep(2)
-        if future.exception():
-            await ctx.respond(f"❌ Transcription job {job_id} failed: {future.exception()}", ephemeral=True)
+        try:
+            # Wake on completion instead of polling; shield so a cancelled command doesn't cancel the job
+            await asyncio.shield(asyncio.wrap_future(future))
+        except Exception as e:
+            await ctx.respond(f"❌ Transcription job {job_id} failed: {e}", ephemeral=True)
         else:
             await ctx.respond(f"✅ Transcription job {job_id} completed!", ephemeral=True)
 
@@ -142,10 +163,9 @@ if __name__ == "__main__":
         if not helper:
             await ctx.respond("Not connected to a voice channel.", ephemeral=True)
             return
-        audio_path = f"Sessions/{guild_id}/session_audio_16k.wav"
-        metadata_path = f"Sessions/{guild_id}/metadata.json"
+        audio_path, metadata_path = session_paths(guild_id)
         await ctx.trigger_typing()
-        result = await transcription_service.transcribe_audio(Path(audio_path), Path(metadata_path))
+        result = await transcription_service.transcribe_audio(audio_path, metadata_path)
         if result.get("error"):
             await ctx.respond(f"❌ Transcription failed: {result['error']}", ephemeral=True)
         else:
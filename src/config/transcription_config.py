@@ -12,6 +12,10 @@ class TranscriptionConfig:
         self.hf_auth_token = os.getenv("HF_TOKEN")
         self.min_speakers = int(os.getenv("TRANSCRIPTION_MIN_SPEAKERS", "1"))
         self.max_speakers = int(os.getenv("TRANSCRIPTION_MAX_SPEAKERS", "10"))
+        self.batch_size = int(os.getenv("TRANSCRIPTION_BATCH_SIZE", "16"))
+        # None selects int8_float16 on CUDA 7.5+ or under 8GB VRAM, float16 on other GPUs and int8 on CPU
+        self.compute_type: Optional[str] = os.getenv("TRANSCRIPTION_COMPUTE_TYPE") or None
+        self.cache_decoded_audio = os.getenv("TRANSCRIPTION_CACHE_DECODED_AUDIO", "false").lower() == "true"
 
     def update(self, **kwargs):
         for key, value in kwargs.items():
@@ -25,4 +29,7 @@ class TranscriptionConfig:
             "hf_auth_token": self.hf_auth_token,
             "min_speakers": self.min_speakers,
             "max_speakers": self.max_speakers,
+            "batch_size": self.batch_size,
+            "compute_type": self.compute_type,
+            "cache_decoded_audio": self.cache_decoded_audio,
         }
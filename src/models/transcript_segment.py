@@ -5,11 +5,15 @@ Represents a segment of transcribed audio with timestamps, text, and optional
 speaker identification and word-level alignment data.
 """
 
+import sys
 from typing import List, Optional
 from dataclasses import dataclass
 
+# Slotted dataclasses (3.10+) drop the per-instance __dict__; long transcripts hold many segments and words
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class WordAlignment:
     """Word-level alignment data within a transcript segment."""
     word: str
@@ -18,7 +22,7 @@ class WordAlignment:
     confidence: float  # Confidence score (0.0 to 1.0)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TranscriptSegment:
     """
     A segment of transcribed audio.
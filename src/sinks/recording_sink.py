@@ -1,7 +1,6 @@
 import logging
 from typing import Optional
 
-import speech_recognition as sr
 from discord.sinks.core import Filters, Sink, default_filters
 
 from src.sinks.session_recorder import SessionRecorder
@@ -22,7 +21,5 @@ class RecordingSink(Sink):
     def write(self, data, user):
         """Receive audio data from Discord."""
         if self.recorder.is_recording:
-            # Convert Discord audio data to speech_recognition AudioData
-            # Discord provides PCM data at 48kHz stereo 16-bit
-            audio_data = sr.AudioData(data, 48000, 4)  # 48kHz, 16-bit stereo = 4 bytes per sample
-            self.recorder.add_audio_data(audio_data)
\ No newline at end of file
+            # Discord provides raw PCM data at 48kHz stereo 16-bit
+            self.recorder.add_audio_bytes(data, user)
\ No newline at end of file
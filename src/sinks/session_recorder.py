@@ -1,29 +1,43 @@
 import asyncio
-import json
 import logging
-import os
 import time
+import wave
 from datetime import datetime
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import discord
+import orjson
 import speech_recognition as sr
 
 from src.models.session_audio import SessionAudio
 from src.models.session_metadata import SessionMetadata
-from src.utils.audio_utils import convert_audio_to_wav, get_audio_duration, save_wav_file
+from src.utils.audio_utils import PCMDownsampler
 
 logger = logging.getLogger(__name__)
 
+WAV_WRITE_CHUNK_BYTES = 1024 * 1024
+DEFAULT_EXPECTED_SESSION_SECONDS = 60 * 60
+AUDIO_SESSIONS_DIR = Path(".logs/audio_sessions")
+
 class SessionRecorder:
-    def __init__(self, voice_client: discord.VoiceClient, guild_id: str, channel_id: str):
+    def __init__(self, voice_client: discord.VoiceClient, guild_id: str, channel_id: str,
+                 expected_duration_seconds: float = DEFAULT_EXPECTED_SESSION_SECONDS):
         self.voice_client = voice_client
         self.guild_id = guild_id
         self.channel_id = channel_id
+        self.output_dir = AUDIO_SESSIONS_DIR / str(guild_id)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         self.participants: List[str] = []
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
-        self.audio_data: List[sr.AudioData] = []
+        self.audio_buffer = bytearray()
+        self.write_pos = 0
+        # One downsampler per speaker, so FIR history never carries from one user's stream into another's
+        self.downsamplers: Dict[Any, PCMDownsampler] = {}
+        self.sample_rate = 16000  # Discord's 48kHz stereo is downmixed to 16kHz mono on ingest
+        self.sample_width = 2     # 16-bit mono = 2 bytes per sample
+        self.capacity_bytes = int(expected_duration_seconds * self.sample_rate * self.sample_width)
         self.is_recording = False
 
     def start_recording(self) -> None:
@@ -34,7 +48,10 @@ class SessionRecorder:
 
         self.start_time = time.time()
         self.participants = [str(member.id) for member in self.voice_client.channel.members if not member.bot]
-        self.audio_data = []
+        # Preallocate for the expected session length so the buffer is not repeatedly reallocated
+        self.audio_buffer = bytearray(self.capacity_bytes)
+        self.write_pos = 0
+        self.downsamplers = {}
         self.is_recording = True
         logger.info(f"Started recording session in guild {self.guild_id}, channel {self.channel_id}")
 
@@ -47,30 +64,17 @@ class SessionRecorder:
         self.end_time = time.time()
         self.is_recording = False
 
-        if not self.audio_data:
+        if not self.write_pos:
             logger.error("No audio data recorded")
             return None, None
 
-        # Combine audio data
-        combined = sr.AudioData(
-            b''.join(data.get_raw_data() for data in self.audio_data),
-            self.audio_data[0].sample_rate,
-            self.audio_data[0].sample_width
-        )
-
-        # Convert to WAV
         try:
-            wav_bytes = convert_audio_to_wav(combined)
-            duration = get_audio_duration(wav_bytes)
-
-            # Create output directory
-            output_dir = f".logs/audio_sessions/{self.guild_id}"
-            os.makedirs(output_dir, exist_ok=True)
+            duration = self.write_pos / (self.sample_rate * self.sample_width)
 
             # Save audio file
             timestamp = datetime.fromtimestamp(self.start_time).strftime('%Y%m%d_%H%M%S')
-            audio_file_path = f"{output_dir}/session_{timestamp}.wav"
-            save_wav_file(wav_bytes, audio_file_path)
+            audio_file_path = self.output_dir / f"session_{timestamp}.wav"
+            self._flush_wav(audio_file_path)
 
             # Create metadata
             metadata = SessionMetadata(
@@ -80,24 +84,23 @@ class SessionRecorder:
                 start_time=datetime.fromtimestamp(self.start_time).isoformat(),
                 end_time=datetime.fromtimestamp(self.end_time).isoformat(),
                 duration=duration,
-                file_path=audio_file_path
+                file_path=str(audio_file_path)
             )
 
             # Save metadata
-            metadata_file_path = f"{output_dir}/session_{timestamp}_metadata.json"
-            with open(metadata_file_path, 'w') as f:
-                json.dump({
-                    "guild_id": metadata.guild_id,
-                    "channel_id": metadata.channel_id,
-                    "participants": metadata.participants,
-                    "start_time": metadata.start_time,
-                    "end_time": metadata.end_time,
-                    "duration": metadata.duration,
-                    "file_path": metadata.file_path
-                }, f, indent=2)
+            metadata_file_path = self.output_dir / f"session_{timestamp}_metadata.json"
+            metadata_file_path.write_bytes(orjson.dumps({
+                "guild_id": metadata.guild_id,
+                "channel_id": metadata.channel_id,
+                "participants": metadata.participants,
+                "start_time": metadata.start_time,
+                "end_time": metadata.end_time,
+                "duration": metadata.duration,
+                "file_path": metadata.file_path
+            }, option=orjson.OPT_INDENT_2))
 
             session_audio = SessionAudio(
-                file_path=audio_file_path,
+                file_path=str(audio_file_path),
                 duration=duration
             )
 
@@ -108,7 +111,44 @@ class SessionRecorder:
             logger.error(f"Error processing audio: {e}")
             return None, None
 
+    def _flush_wav(self, file_path: Path) -> None:
+        """Stream the PCM buffer into a WAV file without copying it."""
+        with wave.open(str(file_path), 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(self.sample_width)
+            wav_file.setframerate(self.sample_rate)
+            with memoryview(self.audio_buffer) as view:
+                for offset in range(0, self.write_pos, WAV_WRITE_CHUNK_BYTES):
+                    wav_file.writeframesraw(view[offset:min(offset + WAV_WRITE_CHUNK_BYTES, self.write_pos)])
+
     def add_audio_data(self, data: sr.AudioData) -> None:
-        """Add audio data from the voice channel."""
+        """
+        Add audio data from the voice channel.
+
+        Compatibility shim for callers holding sr.AudioData; the voice receive
+        path (RecordingSink.write) passes raw bytes to add_audio_bytes instead.
+        """
+        self.add_audio_bytes(data.get_raw_data())
+
+    def add_audio_bytes(self, data: bytes, user_id: Any = None) -> None:
+        """
+        Downsample raw 48kHz stereo PCM bytes and append them to the session buffer.
+
+        Args:
+            data: Raw PCM packet
+            user_id: Speaker the packet belongs to; each speaker keeps its own filter state
+        """
         if self.is_recording:
-            self.audio_data.append(data)
\ No newline at end of file
+            downsampler = self.downsamplers.get(user_id)
+            if downsampler is None:
+                downsampler = self.downsamplers[user_id] = PCMDownsampler()
+            self._write_pcm(downsampler.process(data))
+
+    def _write_pcm(self, pcm: bytes) -> None:
+        """Copy PCM bytes into the preallocated buffer at the write cursor."""
+        end = self.write_pos + len(pcm)
+        if end > len(self.audio_buffer):
+            # Session outgrew the estimate; grow by another expected session rather than doubling
+            self.audio_buffer.extend(bytes(max(len(pcm), self.capacity_bytes)))
+        self.audio_buffer[self.write_pos:end] = pcm
+        self.write_pos = end
\ No newline at end of file
@@ -2,15 +2,41 @@
 Test helpers and utilities for transcription testing.
 Provides reusable functions for test setup, validation, and assertions.
 """
-import json
+import functools
+import os
+import struct
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+import orjson
+
+try:
+    from rapidfuzz.distance import Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    Levenshtein = None
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+    sf = None
+
+# Bytes per sample for libsndfile PCM/float subtypes
+SUBTYPE_SAMPLE_WIDTHS = {
+    "PCM_S8": 1, "PCM_U8": 1, "PCM_16": 2, "PCM_24": 3, "PCM_32": 4, "FLOAT": 4, "DOUBLE": 8,
+}
+
+# RIFF header, 16-byte PCM fmt chunk and data chunk header of a canonical 44-byte WAV header
+_CANONICAL_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
 
 
 def load_json_fixture(fixture_path: str) -> Dict[str, Any]:
     """Load a JSON fixture file for testing."""
-    with open(fixture_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return orjson.loads(Path(fixture_path).read_bytes())
 
 
 def compare_transcripts(actual: Dict[str, Any], expected: Dict[str, Any], tolerance_ms: float = 250) -> List[str]:
@@ -35,22 +61,33 @@ def compare_transcripts(actual: Dict[str, Any], expected: Dict[str, Any], tolera
         differences.append(f"Segment count mismatch: {len(actual_segments)} vs {len(expected_segments)}")
         return differences
     
-    # Compare each segment
-    for i, (actual_seg, expected_seg) in enumerate(zip(actual_segments, expected_segments)):
-        # Check text
-        if actual_seg.get("text", "").strip() != expected_seg.get("text", "").strip():
-            differences.append(f"Segment {i} text mismatch: '{actual_seg.get('text')}' vs '{expected_seg.get('text')}'")
-        
-        # Check timestamps (with tolerance)
-        actual_start = actual_seg.get("start_time", 0)
-        expected_start = expected_seg.get("start_time", 0)
-        if abs(actual_start - expected_start) > (tolerance_ms / 1000):
-            differences.append(f"Segment {i} start_time off by {abs(actual_start - expected_start) * 1000:.0f}ms")
-        
-        actual_end = actual_seg.get("end_time", 0)
-        expected_end = expected_seg.get("end_time", 0)
-        if abs(actual_end - expected_end) > (tolerance_ms / 1000):
-            differences.append(f"Segment {i} end_time off by {abs(actual_end - expected_end) * 1000:.0f}ms")
+    count = len(actual_segments)
+    tolerance = tolerance_ms / 1000
+    
+    def field_array(segments: List[Dict[str, Any]], key: str) -> np.ndarray:
+        return np.fromiter((seg.get(key, 0) for seg in segments), dtype=np.float64, count=count)
+    
+    # Check timestamps (with tolerance) in one vectorized pass
+    start_offsets = np.abs(field_array(actual_segments, "start_time") - field_array(expected_segments, "start_time"))
+    end_offsets = np.abs(field_array(actual_segments, "end_time") - field_array(expected_segments, "end_time"))
+    start_bad = start_offsets > tolerance
+    end_bad = end_offsets > tolerance
+    
+    # Check text
+    text_bad = np.fromiter(
+        (a.get("text", "").strip() != e.get("text", "").strip()
+         for a, e in zip(actual_segments, expected_segments)),
+        dtype=bool, count=count
+    )
+    
+    # Format differences only for mismatching segments
+    for i in np.flatnonzero(text_bad | start_bad | end_bad).tolist():
+        if text_bad[i]:
+            differences.append(f"Segment {i} text mismatch: '{actual_segments[i].get('text')}' vs '{expected_segments[i].get('text')}'")
+        if start_bad[i]:
+            differences.append(f"Segment {i} start_time off by {start_offsets[i] * 1000:.0f}ms")
+        if end_bad[i]:
+            differences.append(f"Segment {i} end_time off by {end_offsets[i] * 1000:.0f}ms")
     
     return differences
 
@@ -68,56 +105,96 @@ def calculate_word_error_rate(actual_text: str, expected_text: str) -> float:
     if not expected_words:
         return 0.0 if not actual_words else 1.0
     
-    # Simple edit distance calculation (Levenshtein for words)
-    m, n = len(actual_words), len(expected_words)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
+    if RAPIDFUZZ_AVAILABLE:
+        # C++ Levenshtein over word sequences
+        return Levenshtein.distance(actual_words, expected_words) / len(expected_words)
     
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if actual_words[i-1] == expected_words[j-1]:
-                dp[i][j] = dp[i-1][j-1]
+    # Fallback: word-level Levenshtein keeping only the previous DP row
+    previous = list(range(len(expected_words) + 1))
+    for i, actual_word in enumerate(actual_words, 1):
+        current = [i]
+        for j, expected_word in enumerate(expected_words, 1):
+            if actual_word == expected_word:
+                current.append(previous[j - 1])
             else:
-                dp[i][j] = 1 + min(dp[i-1][j], dp[i][j-1], dp[i-1][j-1])
+                current.append(1 + min(previous[j], current[j - 1], previous[j - 1]))
+        previous = current
     
-    return dp[m][n] / n
+    return previous[-1] / len(expected_words)
 
 
 def validate_audio_file(audio_path: str, expected_sample_rate: int = 16000, expected_duration: float = None) -> List[str]:
     """
     Validate audio file format and properties.
     
+    Results are cached on (path, modification time, size, expectations), so tests that
+    check the same unchanged file share one header parse.
+    
     Returns:
         List of validation errors (empty if valid)
     """
-    import wave
+    try:
+        stat = os.stat(audio_path)
+    except OSError as e:
+        return [f"Failed to read audio file: {e}"]
+    return list(_validate_audio_file_cached(str(audio_path), stat.st_mtime_ns, stat.st_size,
+                                            expected_sample_rate, expected_duration))
+
+
+@functools.lru_cache(maxsize=128)
+def _validate_audio_file_cached(audio_path: str, mtime_ns: int, size: int, expected_sample_rate: int,
+                                expected_duration: float) -> Tuple[str, ...]:
+    """Validate an audio file, cached on (path, modification time, size, expectations)."""
     errors = []
     
     try:
-        with wave.open(audio_path, 'rb') as wav:
-            sample_rate = wav.getframerate()
-            channels = wav.getnchannels()
-            sample_width = wav.getsampwidth()
-            frames = wav.getnframes()
-            duration = frames / sample_rate
-            
-            if sample_rate != expected_sample_rate:
-                errors.append(f"Sample rate {sample_rate} != expected {expected_sample_rate}")
-            
-            if channels != 1:
-                errors.append(f"Expected mono audio, got {channels} channels")
-            
-            if sample_width != 2:
-                errors.append(f"Expected 16-bit audio, got {sample_width * 8}-bit")
-            
-            if expected_duration is not None and abs(duration - expected_duration) > 0.5:
-                errors.append(f"Duration {duration:.2f}s != expected {expected_duration:.2f}s")
+        sample_rate, channels, sample_width, frames = _read_audio_header(audio_path)
+        duration = frames / sample_rate
+        
+        if sample_rate != expected_sample_rate:
+            errors.append(f"Sample rate {sample_rate} != expected {expected_sample_rate}")
+        
+        if channels != 1:
+            errors.append(f"Expected mono audio, got {channels} channels")
+        
+        if sample_width != 2:
+            errors.append(f"Expected 16-bit audio, got {sample_width * 8}-bit")
+        
+        if expected_duration is not None and abs(duration - expected_duration) > 0.5:
+            errors.append(f"Duration {duration:.2f}s != expected {expected_duration:.2f}s")
     
     except Exception as e:
         errors.append(f"Failed to read audio file: {e}")
     
-    return errors
+    return tuple(errors)
+
+
+def _read_audio_header(audio_path: str) -> Tuple[int, int, int, int]:
+    """
+    Read audio format from the file header without decoding samples.
+    
+    Canonical PCM WAV headers are unpacked directly; anything else (including
+    non-RIFF formats such as FLAC or RF64) goes through libsndfile via soundfile
+    when available, falling back to the stdlib wave module.
+    
+    Returns:
+        Tuple of (sample_rate, channels, sample_width_bytes, frames)
+    """
+    with open(audio_path, 'rb') as f:
+        header = f.read(_CANONICAL_WAV_HEADER.size)
+    
+    is_riff_wave = header[0:4] == b'RIFF' and header[8:12] == b'WAVE'
+    if is_riff_wave and len(header) == _CANONICAL_WAV_HEADER.size:
+        (_, _, _, fmt_id, fmt_size, audio_format, channels, sample_rate, _, block_align,
+         bits_per_sample, data_id, data_size) = _CANONICAL_WAV_HEADER.unpack(header)
+        if (fmt_id == b'fmt ' and fmt_size == 16 and audio_format == 1
+                and data_id == b'data' and block_align):
+            return sample_rate, channels, bits_per_sample // 8, data_size // block_align
+    
+    if SOUNDFILE_AVAILABLE:
+        info = sf.info(audio_path)
+        return info.samplerate, info.channels, SUBTYPE_SAMPLE_WIDTHS.get(info.subtype, 0), info.frames
+    
+    import wave
+    with wave.open(audio_path, 'rb') as wav:
+        return wav.getframerate(), wav.getnchannels(), wav.getsampwidth(), wav.getnframes()
@@ -2,13 +2,94 @@
 Schema and data validators for transcription testing.
 Provides validation logic for transcription outputs, metadata, and logs.
 """
+import math
 from typing import Dict, Any, List
 
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+    fastjsonschema = None
+
+
+# Structural transcript schema; timestamp checks (finite, end_time > start_time) are done separately
+TRANSCRIPT_SCHEMA = {
+    "type": "object",
+    "required": ["metadata", "segments", "log"],
+    "properties": {
+        "metadata": {
+            "type": "object",
+            "required": ["guild_id", "channel_id", "start_time", "end_time", "sample_rate"],
+        },
+        "segments": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["start_time", "end_time", "speaker", "text"],
+                "properties": {
+                    "words": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["word", "start", "end", "confidence"],
+                        },
+                    },
+                },
+            },
+        },
+        "log": {
+            "type": "object",
+            "required": ["model", "language", "duration"],
+        },
+    },
+}
+
+_compiled_transcript_validator = fastjsonschema.compile(TRANSCRIPT_SCHEMA) if FASTJSONSCHEMA_AVAILABLE else None
+
 
 def validate_transcript_schema(transcript: Dict[str, Any]) -> List[str]:
     """
     Validate transcript JSON against expected schema.
     
+    Structurally valid transcripts are checked with a precompiled JSON-Schema
+    validator; the detailed field-by-field walk only runs to report errors.
+    
+    Returns:
+        List of validation errors (empty if valid)
+    """
+    if _compiled_transcript_validator is None:
+        return _collect_transcript_schema_errors(transcript)
+    
+    try:
+        _compiled_transcript_validator(transcript)
+    except fastjsonschema.JsonSchemaException:
+        return _collect_transcript_schema_errors(transcript)
+    
+    errors = []
+    for i, segment in enumerate(transcript["segments"]):
+        errors.extend(_segment_timing_errors(i, segment))
+    return errors
+
+
+def _segment_timing_errors(i: int, segment: Dict[str, Any]) -> List[str]:
+    """
+    Check that a segment's timestamps are finite and ordered.
+    
+    Returns:
+        List of validation errors (empty if valid)
+    """
+    if not (math.isfinite(segment["start_time"]) and math.isfinite(segment["end_time"])):
+        return [f"Segment {i} start_time and end_time must be finite"]
+    if segment["end_time"] <= segment["start_time"]:
+        return [f"Segment {i} end_time must be > start_time"]
+    return []
+
+
+def _collect_transcript_schema_errors(transcript: Dict[str, Any]) -> List[str]:
+    """
+    Walk the transcript field by field and report every schema violation.
+    
     Returns:
         List of validation errors (empty if valid)
     """
@@ -43,8 +124,7 @@ def validate_transcript_schema(transcript: Dict[str, Any]) -> List[str]:
             
             # Validate timestamps
             if "start_time" in segment and "end_time" in segment:
-                if segment["end_time"] <= segment["start_time"]:
-                    errors.append(f"Segment {i} end_time must be > start_time")
+                errors.extend(_segment_timing_errors(i, segment))
             
             # Validate words if present
             if "words" in segment:
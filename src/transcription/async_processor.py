@@ -6,32 +6,45 @@ tasks while maintaining responsiveness in the Discord bot.
 """
 
 import asyncio
+import functools
 import logging
+import os
 from concurrent.futures import ThreadPoolExecutor, Future
-from contextlib import asynccontextmanager
 from typing import Any, Callable, Optional, TypeVar
 
+logger = logging.getLogger(__name__)
+
 T = TypeVar('T')
 
+# Transcription is GPU/CPU bound: keep the pool small to avoid CUDA and cache contention
+DEFAULT_TRANSCRIBE_WORKERS = min(2, os.cpu_count() or 2)
+# Audio loading and disk writes are I/O bound and benefit from more threads
+DEFAULT_IO_WORKERS = max(8, (os.cpu_count() or 4) * 2)
+
 
 class AsyncProcessor:
     """
     Asynchronous processor for transcription operations.
 
-    Manages a thread pool executor to run blocking WhisperX operations
-    asynchronously, preventing the Discord bot from becoming unresponsive.
+    Manages a small thread pool for blocking WhisperX operations and a wider
+    one for I/O-bound work, preventing the Discord bot from becoming unresponsive.
     """
 
-    def __init__(self, max_workers: int = 8):
+    def __init__(self, max_workers: Optional[int] = None, io_workers: Optional[int] = None):
         """
         Initialize the async processor.
 
         Args:
-            max_workers: Maximum number of worker threads (default: 8)
+            max_workers: Maximum number of transcription worker threads
+                (default: LOREKEEPER_TRANSCRIBE_WORKERS or min(2, cpu_count))
+            io_workers: Maximum number of I/O worker threads (default: max(8, 2 * cpu_count))
         """
+        if max_workers is None:
+            max_workers = int(os.getenv("LOREKEEPER_TRANSCRIBE_WORKERS", DEFAULT_TRANSCRIBE_WORKERS))
         self.max_workers = max_workers
+        self.io_workers = io_workers or DEFAULT_IO_WORKERS
         self.executor: Optional[ThreadPoolExecutor] = None
-        self.logger = logging.getLogger(self.__class__.__name__)
+        self.io_executor: Optional[ThreadPoolExecutor] = None
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -40,20 +53,26 @@ class AsyncProcessor:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        if exc_val is not None:
+            logger.error("Error in transcription context: %s", exc_val)
         await self.stop()
 
     def start(self) -> None:
-        """Start the thread pool executor."""
+        """Start the thread pool executors."""
         if self.executor is None:
             self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="transcription")
-            self.logger.info(f"Started async processor with {self.max_workers} worker threads")
+            self.io_executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="io")
+            logger.info(f"Started async processor with {self.max_workers} transcription "
+                             f"and {self.io_workers} I/O worker threads")
 
     async def stop(self) -> None:
-        """Stop the thread pool executor."""
+        """Stop the thread pool executors."""
         if self.executor:
             self.executor.shutdown(wait=True)
+            self.io_executor.shutdown(wait=True)
             self.executor = None
-            self.logger.info("Stopped async processor")
+            self.io_executor = None
+            logger.info("Stopped async processor")
 
     async def run_in_thread(self, func: Callable[..., T], *args, **kwargs) -> T:
         """
@@ -71,18 +90,45 @@ class AsyncProcessor:
             RuntimeError: If executor is not started
         """
         if not self.executor:
-            self.logger.error("Async processor not started. Use start() or async context manager.")
+            logger.error("Async processor not started. Use start() or async context manager.")
             raise RuntimeError("Async processor not started. Use start() or async context manager.")
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        if kwargs:
+            func = functools.partial(func, **kwargs)
         try:
-            result = await loop.run_in_executor(self.executor, func, *args, **kwargs)
+            result = await loop.run_in_executor(self.executor, func, *args)
             return result
         except Exception as e:
-            self.logger.error(f"Error running {func.__name__} in thread: {e}")
+            logger.error("Error running %s in thread: %s", getattr(func, '__name__', 'anon'), e)
             # Optionally, return a default value or re-raise
             raise
 
+    async def run_io_task(self, func: Callable[..., T], *args) -> T:
+        """
+        Run a blocking I/O function (audio loading, disk writes) in the I/O thread pool.
+
+        Args:
+            func: The blocking function to run
+            *args: Positional arguments for the function
+
+        Returns:
+            The result of the function call
+
+        Raises:
+            RuntimeError: If executor is not started
+        """
+        if not self.io_executor:
+            logger.error("Async processor not started. Use start() or async context manager.")
+            raise RuntimeError("Async processor not started. Use start() or async context manager.")
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.io_executor, func, *args)
+        except Exception as e:
+            logger.error("Error running %s in I/O thread: %s", getattr(func, '__name__', 'anon'), e)
+            raise
+
     async def run_transcription_task(self, transcription_func: Callable[..., T],
                                    *args, **kwargs) -> T:
         """
@@ -99,41 +145,42 @@ class AsyncProcessor:
         Returns:
             Transcription result
         """
-        self.logger.info(f"Starting transcription task: {transcription_func.__name__}")
+        name = getattr(transcription_func, '__name__', 'anon')
+        info = logger.isEnabledFor(logging.INFO)
+        if info:
+            logger.info("Starting transcription task: %s", name)
 
         try:
             result = await self.run_in_thread(transcription_func, *args, **kwargs)
-            self.logger.info(f"Completed transcription task: {transcription_func.__name__}")
+            if info:
+                logger.info("Completed transcription task: %s", name)
             return result
         except Exception as e:
-            self.logger.error(f"Transcription task failed: {transcription_func.__name__} - {e}")
+            logger.error("Transcription task failed: %s - %s", name, e)
             raise
 
-    @asynccontextmanager
-    async def transcription_context(self):
+    def transcription_context(self) -> "AsyncProcessor":
         """
         Context manager for transcription operations.
 
-        Ensures proper setup and cleanup for transcription tasks.
+        Deprecated: use ``async with processor:`` directly. Kept for API
+        compatibility; returns the processor itself so entry and exit go
+        straight to __aenter__/__aexit__ without a generator wrapper.
         """
-        async with self:
-            try:
-                yield
-            except Exception as e:
-                self.logger.error(f"Error in transcription context: {e}")
-                raise
-
-
-# Global async processor instance
-_async_processor: Optional[AsyncProcessor] = None
+        return self
 
 
+@functools.lru_cache(maxsize=1)
 def get_async_processor() -> AsyncProcessor:
-    """Get the global async processor instance."""
-    global _async_processor
-    if _async_processor is None:
-        _async_processor = AsyncProcessor()
-    return _async_processor
+    """
+    Get the global async processor instance.
+
+    The lru_cache makes creation happen exactly once, even if called concurrently.
+    The executors are started here; their threads are only spawned on first use.
+    """
+    processor = AsyncProcessor()
+    processor.start()
+    return processor
 
 
 async def run_transcription_async(func: Callable[..., T], *args, **kwargs) -> T:
@@ -150,5 +197,4 @@ async def run_transcription_async(func: Callable[..., T], *args, **kwargs) -> T:
     Returns:
         Function result
     """
-    processor = get_async_processor()
-    return await processor.run_transcription_task(func, *args, **kwargs)
\ No newline at end of file
+    return await get_async_processor().run_transcription_task(func, *args, **kwargs)
\ No newline at end of file
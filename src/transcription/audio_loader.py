@@ -6,6 +6,9 @@ ensuring they are suitable for WhisperX processing.
 """
 
 import logging
+import os
+import tempfile
+from math import gcd
 from pathlib import Path
 from typing import Optional, Tuple, Any, Dict
 import numpy as np
@@ -17,6 +20,42 @@ except ImportError:
     LIBROSA_AVAILABLE = False
     librosa = None
 
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+    sf = None
+
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+    soxr = None
+
+try:
+    from scipy import signal as scipy_signal
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    scipy_signal = None
+
+from ..utils.hashing import file_sha256
+
+logger = logging.getLogger(__name__)
+
+# Opt-in decoded-audio cache: one .npy per (source content, sample rate, resample quality),
+# evicted least-recently-used first once the directory grows past its size budget
+DEFAULT_AUDIO_CACHE_DIR = Path(".logs/audio_cache")
+DEFAULT_AUDIO_CACHE_MAX_MB = 2048
+
+# Compressed formats libsndfile may not decode; these go through librosa/audioread
+LIBROSA_ONLY_SUFFIXES = {'.mp3', '.m4a'}
+
+# Frames decoded per block when streaming a file through soundfile
+STREAM_BLOCK_FRAMES = 1 << 18
+
 
 class AudioLoader:
     """
@@ -26,20 +65,37 @@ class AudioLoader:
     (16kHz mono format preferred).
     """
 
-    def __init__(self):
-        """Initialize the audio loader."""
-        self.logger = logging.getLogger(self.__class__.__name__)
+    def __init__(self, cache_decoded: bool = False, cache_dir: Optional[Path] = None,
+                 cache_max_bytes: Optional[int] = None):
+        """
+        Initialize the audio loader.
 
-        if not LIBROSA_AVAILABLE:
-            self.logger.warning("librosa not available. Audio loading may be limited.")
+        Args:
+            cache_decoded: Save decoded audio as .npy files in cache_dir, keyed by a
+                SHA-256 of the source file, and memory-map them on later loads (default: False)
+            cache_dir: Directory for decoded audio
+                (default: LOREKEEPER_AUDIO_CACHE or .logs/audio_cache)
+            cache_max_bytes: Size budget for cache_dir; least recently used entries are
+                evicted beyond it (default: LOREKEEPER_AUDIO_CACHE_MAX_MB or 2048 MB)
+        """
+        self.cache_decoded = cache_decoded
+        self.cache_dir = Path(cache_dir or os.getenv("LOREKEEPER_AUDIO_CACHE") or DEFAULT_AUDIO_CACHE_DIR)
+        if cache_max_bytes is None:
+            cache_max_bytes = int(os.getenv("LOREKEEPER_AUDIO_CACHE_MAX_MB", DEFAULT_AUDIO_CACHE_MAX_MB)) * 1024 * 1024
+        self.cache_max_bytes = cache_max_bytes
 
-    def load_audio(self, audio_path: Path, target_sample_rate: int = 16000) -> Tuple[np.ndarray, int]:
+        if not LIBROSA_AVAILABLE and not SOUNDFILE_AVAILABLE:
+            logger.warning("Neither soundfile nor librosa available. Audio loading may be limited.")
+
+    def load_audio(self, audio_path: Path, target_sample_rate: int = 16000,
+                   quality: str = 'HQ') -> Tuple[np.ndarray, int]:
         """
         Load audio file and resample to target rate if needed.
 
         Args:
             audio_path: Path to the audio file
             target_sample_rate: Target sample rate (default: 16000 for WhisperX)
+            quality: soxr resampling quality ('QQ', 'LQ', 'MQ', 'HQ', 'VHQ')
 
         Returns:
             Tuple of (audio_array, sample_rate)
@@ -52,12 +108,31 @@ class AudioLoader:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
+        cache_path = None
+        if self.cache_decoded:
+            cache_path = self._cache_path(audio_path, target_sample_rate, quality)
+            try:
+                # Copy-on-write map: zero-copy reads, and callers may still get a writable array
+                audio = np.load(cache_path, mmap_mode='c')
+                # Mark as recently used for eviction
+                os.utime(cache_path)
+                logger.info(f"Loaded cached audio: {cache_path}")
+                return audio, target_sample_rate
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable audio cache {cache_path}: {e}")
+
         try:
-            self.logger.info(f"Loading audio file: {audio_path}")
+            logger.info(f"Loading audio file: {audio_path}")
 
-            if LIBROSA_AVAILABLE:
+            if SOUNDFILE_AVAILABLE and audio_path.suffix.lower() not in LIBROSA_ONLY_SUFFIXES:
+                # Decode straight into a preallocated buffer via libsndfile
+                audio, sample_rate = self._load_with_soundfile(audio_path, target_sample_rate, quality)
+            elif LIBROSA_AVAILABLE:
                 # Use librosa for robust audio loading
-                audio, sample_rate = librosa.load(str(audio_path), sr=target_sample_rate, mono=True)
+                audio, sample_rate = librosa.load(str(audio_path), sr=target_sample_rate, mono=True,
+                                                  res_type=self._librosa_res_type(quality))
             else:
                 # Fallback to basic numpy/scipy if available
                 try:
@@ -73,7 +148,7 @@ class AudioLoader:
 
                     # Resample if needed
                     if sample_rate != target_sample_rate:
-                        audio = self._resample_audio(audio, sample_rate, target_sample_rate)
+                        audio = self._resample_audio(audio, sample_rate, target_sample_rate, quality)
                         sample_rate = target_sample_rate
 
                 except ImportError:
@@ -82,15 +157,148 @@ class AudioLoader:
             # Validate loaded audio
             self._validate_audio_data(audio, sample_rate)
 
-            self.logger.info(f"Successfully loaded audio: {len(audio)} samples at {sample_rate}Hz")
+            if self.cache_decoded and sample_rate == target_sample_rate:
+                self._save_cache(cache_path, audio)
+
+            logger.info(f"Successfully loaded audio: {len(audio)} samples at {sample_rate}Hz")
             return audio, sample_rate
 
         except Exception as e:
             error_msg = f"Failed to load audio file {audio_path}: {e}"
-            self.logger.error(error_msg)
+            logger.error(error_msg)
             raise RuntimeError(error_msg) from e
 
-    def resample_audio(self, audio: np.ndarray, original_rate: int, target_rate: int) -> np.ndarray:
+    def _load_with_soundfile(self, audio_path: Path, target_sample_rate: int,
+                             quality: str = 'HQ') -> Tuple[np.ndarray, int]:
+        """
+        Stream audio through soundfile into a single preallocated mono float32 buffer.
+
+        Blocks of STREAM_BLOCK_FRAMES are decoded into a reused scratch buffer and
+        downmixed in place, and (with soxr) resampled as they arrive, so peak memory
+        stays close to the size of the final array.
+
+        Args:
+            audio_path: Path to the audio file
+            target_sample_rate: Target sample rate
+            quality: soxr resampling quality
+
+        Returns:
+            Tuple of (mono float32 audio_array, sample_rate)
+        """
+        with sf.SoundFile(str(audio_path)) as f:
+            sample_rate = f.samplerate
+            total_frames = f.frames
+
+            resampler = None
+            capacity = total_frames
+            if sample_rate != target_sample_rate and SOXR_AVAILABLE:
+                resampler = soxr.ResampleStream(sample_rate, target_sample_rate, 1,
+                                                dtype='float32', quality=quality)
+                capacity = int(np.ceil(total_frames * target_sample_rate / sample_rate))
+
+            audio = np.empty(capacity, dtype=np.float32)
+            block = np.empty((min(STREAM_BLOCK_FRAMES, total_frames), f.channels), dtype=np.float32)
+            mono = np.empty(len(block), dtype=np.float32)
+            offset = 0
+
+            while True:
+                data = f.read(out=block, dtype='float32', always_2d=True)
+                frames_read = len(data)
+                if frames_read == 0:
+                    break
+
+                if data.shape[1] == 1:
+                    chunk = data[:, 0]
+                else:
+                    chunk = np.mean(data, axis=1, out=mono[:frames_read])
+
+                if resampler is not None:
+                    chunk = resampler.resample_chunk(chunk)
+                audio, offset = self._append_samples(audio, offset, chunk)
+
+                if frames_read < len(block):
+                    break
+
+        if resampler is not None:
+            tail = resampler.resample_chunk(np.empty(0, dtype=np.float32), last=True)
+            audio, offset = self._append_samples(audio, offset, tail)
+            sample_rate = target_sample_rate
+
+        audio = audio[:offset]
+
+        if sample_rate != target_sample_rate:
+            audio = self._resample_audio(audio, sample_rate, target_sample_rate, quality)
+            sample_rate = target_sample_rate
+
+        return audio, sample_rate
+
+    @staticmethod
+    def _append_samples(audio: np.ndarray, offset: int, chunk: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Copy chunk into audio at offset, growing the buffer if the estimate fell short."""
+        end = offset + len(chunk)
+        if end > len(audio):
+            grown = np.empty(end, dtype=np.float32)
+            grown[:offset] = audio[:offset]
+            audio = grown
+        audio[offset:end] = chunk
+        return audio, end
+
+    def _cache_path(self, audio_path: Path, sample_rate: int, quality: str) -> Path:
+        """Content-addressed path of the decoded audio for a source file, sample rate and resample quality."""
+        return self.cache_dir / f'{file_sha256(audio_path)}.{sample_rate}.{quality.upper()}.f32.npy'
+
+    def _save_cache(self, cache_path: Path, audio: np.ndarray) -> None:
+        """
+        Atomically write decoded audio to the cache, then evict old entries.
+
+        Failures (e.g. read-only directories) are logged and otherwise ignored.
+
+        Args:
+            cache_path: Cache path from _cache_path
+            audio: Decoded mono audio
+        """
+        tmp_name = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, audio.astype(np.float32, copy=False))
+            os.replace(tmp_name, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not cache decoded audio to {cache_path}: {e}")
+            if tmp_name:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+            return
+        self._evict_cache(keep=cache_path)
+
+    def _evict_cache(self, keep: Path) -> None:
+        """Delete least recently used cache entries until the cache fits its size budget."""
+        entries = []
+        for path in self.cache_dir.glob('*.f32.npy'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                total -= size
+            except OSError as e:
+                # e.g. still memory-mapped on Windows
+                logger.debug(f"Could not evict cached audio {path}: {e}")
+
+    def resample_audio(self, audio: np.ndarray, original_rate: int, target_rate: int,
+                       quality: str = 'HQ') -> np.ndarray:
         """
         Public method to resample audio to target sample rate.
 
@@ -98,26 +306,40 @@ class AudioLoader:
             audio: Audio array
             original_rate: Original sample rate
             target_rate: Target sample rate
+            quality: soxr resampling quality ('QQ', 'LQ', 'MQ', 'HQ', 'VHQ')
 
         Returns:
             Resampled audio array
         """
-        return self._resample_audio(audio, original_rate, target_rate)
+        return self._resample_audio(audio, original_rate, target_rate, quality)
 
-    def _resample_audio(self, audio: np.ndarray, original_rate: int, target_rate: int) -> np.ndarray:
+    def _resample_audio(self, audio: np.ndarray, original_rate: int, target_rate: int,
+                        quality: str = 'HQ') -> np.ndarray:
         """
         Resample audio to target sample rate.
 
+        Prefers soxr's polyphase resampler, then librosa, then scipy's resample_poly,
+        and only falls back to linear interpolation when none are installed.
+
         Args:
             audio: Audio array
             original_rate: Original sample rate
             target_rate: Target sample rate
+            quality: soxr resampling quality
 
         Returns:
             Resampled audio array
         """
-        if LIBROSA_AVAILABLE:
-            return librosa.resample(audio, orig_sr=original_rate, target_sr=target_rate)
+        if SOXR_AVAILABLE:
+            return soxr.resample(audio.astype(np.float32, copy=False), original_rate, target_rate, quality=quality)
+        elif LIBROSA_AVAILABLE:
+            return librosa.resample(audio, orig_sr=original_rate, target_sr=target_rate,
+                                    res_type=self._librosa_res_type(quality))
+        elif SCIPY_AVAILABLE:
+            # Polyphase FIR via compiled upfirdn
+            g = gcd(target_rate, original_rate)
+            resampled = scipy_signal.resample_poly(audio, target_rate // g, original_rate // g)
+            return resampled.astype(np.float32, copy=False)
         else:
             # Simple linear interpolation fallback (not ideal but works)
             ratio = target_rate / original_rate
@@ -128,6 +350,11 @@ class AudioLoader:
                 audio
             )
 
+    @staticmethod
+    def _librosa_res_type(quality: str) -> str:
+        """Map a soxr quality name onto the closest librosa resampler."""
+        return 'kaiser_best' if quality.upper() == 'VHQ' else 'kaiser_fast'
+
     def _validate_audio_data(self, audio: np.ndarray, sample_rate: int) -> None:
         """
         Validate loaded audio data.
@@ -139,7 +366,8 @@ class AudioLoader:
         Raises:
             ValueError: If audio data is invalid
         """
-        if len(audio) == 0:
+        num_samples = len(audio)
+        if num_samples == 0:
             raise ValueError("Audio file is empty")
 
         if sample_rate <= 0:
@@ -147,19 +375,19 @@ class AudioLoader:
 
         # Check for minimum duration (WhisperX needs at least ~0.1 seconds)
         min_samples = int(0.1 * sample_rate)
-        if len(audio) < min_samples:
-            raise ValueError(f"Audio too short: {len(audio)} samples < {min_samples} required")
+        if num_samples < min_samples:
+            raise ValueError(f"Audio too short: {num_samples} samples < {min_samples} required")
 
-        # Check for valid audio range
-        if np.max(np.abs(audio)) == 0:
+        # Check for valid audio range (min/max reductions avoid an abs() temporary)
+        if audio.min() == 0 and audio.max() == 0:
             raise ValueError("Audio appears to be silent (all zeros)")
 
         # Warn about very long audio
         max_duration_hours = 2  # Based on plan.md constraints
         max_samples = max_duration_hours * 3600 * sample_rate
-        if len(audio) > max_samples:
-            duration_hours = len(audio) / (sample_rate * 3600)
-            self.logger.warning(f"Audio duration ({duration_hours:.1f}h) exceeds recommended limit ({max_duration_hours}h)")
+        if num_samples > max_samples:
+            duration_hours = num_samples / (sample_rate * 3600)
+            logger.warning(f"Audio duration ({duration_hours:.1f}h) exceeds recommended limit ({max_duration_hours}h)")
 
     def get_audio_info(self, audio_path: Path) -> Optional[Dict[str, Any]]:
         """
@@ -172,6 +400,17 @@ class AudioLoader:
             Dictionary with audio info or None if unable to read
         """
         try:
+            librosa_only = audio_path.suffix.lower() in LIBROSA_ONLY_SUFFIXES
+            if SOUNDFILE_AVAILABLE and (not librosa_only or not LIBROSA_AVAILABLE):
+                # Header-only read; no decoding (newer libsndfile also reads mp3 headers)
+                info = sf.info(str(audio_path))
+                return {
+                    "duration_seconds": info.frames / info.samplerate,
+                    "sample_rate": info.samplerate,
+                    "channels": info.channels,
+                    "file_size_bytes": audio_path.stat().st_size,
+                    "file_format": audio_path.suffix
+                }
             if LIBROSA_AVAILABLE:
                 info = librosa.get_duration(filename=str(audio_path))
                 return {
@@ -180,6 +419,6 @@ class AudioLoader:
                     "file_format": audio_path.suffix
                 }
         except Exception as e:
-            self.logger.warning(f"Could not get audio info for {audio_path}: {e}")
+            logger.warning(f"Could not get audio info for {audio_path}: {e}")
 
         return None
\ No newline at end of file
@@ -5,16 +5,20 @@ Combines WhisperX transcription and alignment with pyannote speaker diarization
 to provide complete multi-speaker transcription with speaker labels.
 """
 
+import asyncio
 import logging
+import time
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime
 
+from .async_processor import get_async_processor
 from .diarization_service import DiarizationService
 from .whisper_runner import WhisperRunner
 from ..models.transcript_segment import TranscriptSegment
 from ..models.transcription_log import TranscriptionLog
 
+logger = logging.getLogger(__name__)
+
 
 class DiarizationRunner:
     """
@@ -25,7 +29,8 @@ class DiarizationRunner:
     """
 
     def __init__(self, model_name: str = "large-v3", auth_token: Optional[str] = None,
-                 min_speakers: int = 1, max_speakers: int = 10):
+                 min_speakers: int = 1, max_speakers: int = 10, batch_size: int = 16,
+                 whisper_runner: Optional[WhisperRunner] = None, compute_type: Optional[str] = None):
         """
         Initialize the diarization runner.
 
@@ -34,19 +39,31 @@ class DiarizationRunner:
             auth_token: HuggingFace authentication token for pyannote
             min_speakers: Minimum number of speakers to detect (default: 1)
             max_speakers: Maximum number of speakers to detect (default: 10)
+            batch_size: WhisperX transcription batch size (default: 16)
+            whisper_runner: Existing WhisperRunner to share (created if not provided)
+            compute_type: CTranslate2 compute type for a newly created WhisperRunner
+                (default: int8_float16 on CUDA 7.5+, float16 on older GPUs, int8 on CPU)
         """
         self.model_name = model_name
-        self.logger = logging.getLogger(self.__class__.__name__)
 
         # Initialize components
-        self.whisper_runner = WhisperRunner(model_name)
+        self.whisper_runner = whisper_runner or WhisperRunner(model_name, batch_size, compute_type)
         self.diarization_service = DiarizationService(auth_token, min_speakers, max_speakers)
 
-    def transcribe_with_diarization(self, audio_path: Path,
-                                  language: str = "en") -> Tuple[List[TranscriptSegment], TranscriptionLog]:
+        # get_diarization_status cache, keyed on pipeline identity and whisper model load state
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_key: Optional[Tuple[int, bool]] = None
+
+    async def transcribe_with_diarization(self, audio_path: Path,
+                                        language: str = "en") -> Tuple[List[TranscriptSegment], TranscriptionLog]:
         """
         Transcribe audio with speaker diarization.
 
+        WhisperX transcription and pyannote diarization are independent, so both
+        run concurrently on the async processor's transcription pool, sharing the
+        audio decoded on its I/O pool. This method is a coroutine; synchronous
+        callers should use transcribe_with_diarization_sync.
+
         Args:
             audio_path: Path to the audio file
             language: Language code for transcription
@@ -54,22 +71,28 @@ class DiarizationRunner:
         Returns:
             Tuple of (transcript_segments_with_speakers, transcription_log)
         """
-        start_time = datetime.now()
+        start = time.perf_counter()
 
         try:
-            self.logger.info(f"Starting transcription with diarization: {audio_path}")
+            logger.info(f"Starting transcription with diarization: {audio_path}")
 
-            # Step 1: Run WhisperX transcription and alignment
-            self.logger.info("Running WhisperX transcription...")
-            segments, whisper_log = self.whisper_runner.transcribe_audio(audio_path, language)
+            processor = get_async_processor()
 
-            # Step 2: Run speaker diarization
-            self.logger.info("Running speaker diarization...")
-            diarization_result = self.diarization_service.diarize_audio(audio_path)
+            # Decode once and share the samples between both stages
+            audio, sample_rate = await processor.run_io_task(
+                self.whisper_runner.audio_loader.load_audio, audio_path
+            )
+
+            # Steps 1 and 2: Run WhisperX transcription/alignment and speaker diarization concurrently
+            logger.info("Running WhisperX transcription and speaker diarization...")
+            (segments, whisper_log), diarization_result = await asyncio.gather(
+                processor.run_in_thread(self.whisper_runner.transcribe_audio_array, audio, sample_rate, language),
+                processor.run_in_thread(self.diarization_service.diarize_audio_array, audio, sample_rate),
+            )
 
             # Step 3: Combine results
             if diarization_result and self.diarization_service.validate_diarization_result(diarization_result):
-                self.logger.info("Assigning speakers to transcript segments...")
+                logger.info("Assigning speakers to transcript segments...")
                 segments_with_speakers = self.diarization_service.assign_speakers_to_segments(
                     segments, diarization_result
                 )
@@ -82,42 +105,68 @@ class DiarizationRunner:
                         "diarization_total_duration": speaker_summary["total_duration"]
                     })
 
-                self.logger.info(f"Diarization successful: {speaker_summary['total_speakers']} speakers detected")
+                logger.info(f"Diarization successful: {speaker_summary['total_speakers']} speakers detected")
             else:
-                self.logger.warning("Diarization failed or returned invalid results, proceeding without speaker labels")
+                logger.warning("Diarization failed or returned invalid results, proceeding without speaker labels")
                 segments_with_speakers = segments
                 whisper_log.errors.append("Speaker diarization failed")
 
             # Update runtime to include diarization time
-            whisper_log.runtime = (datetime.now() - start_time).total_seconds()
+            whisper_log.runtime = time.perf_counter() - start
 
-            self.logger.info(f"Transcription with diarization completed in {whisper_log.runtime:.2f}s")
+            logger.info(f"Transcription with diarization completed in {whisper_log.runtime:.2f}s")
             return segments_with_speakers, whisper_log
 
         except Exception as e:
             error_msg = f"Transcription with diarization failed: {e}"
-            self.logger.error(error_msg)
+            logger.error(error_msg)
 
             raise RuntimeError(error_msg) from e
 
+    def transcribe_with_diarization_sync(self, audio_path: Path,
+                                         language: str = "en") -> Tuple[List[TranscriptSegment], TranscriptionLog]:
+        """
+        Blocking wrapper around transcribe_with_diarization for callers without an event loop.
+
+        Args:
+            audio_path: Path to the audio file
+            language: Language code for transcription
+
+        Returns:
+            Tuple of (transcript_segments_with_speakers, transcription_log)
+        """
+        return asyncio.run(self.transcribe_with_diarization(audio_path, language))
+
     def get_diarization_status(self) -> Dict[str, Any]:
         """
         Get the status of diarization capabilities.
 
+        The result is cached until the diarization pipeline is replaced or the
+        WhisperX model is loaded or unloaded.
+
         Returns:
             Dictionary with diarization status information
         """
+        pipeline = self.diarization_service.pipeline
+        whisper_loaded = self.whisper_runner.model_manager.get_model_info(self.whisper_runner.model_name) is not None
+        key = (id(pipeline), whisper_loaded)
+        if self._status_cache is not None and key == self._status_key:
+            return dict(self._status_cache)
+
         status = {
-            "diarization_available": self.diarization_service.pipeline is not None,
-            "whisper_available": self.whisper_runner is not None and self.whisper_runner.model is not None,
+            "diarization_available": pipeline is not None,
+            "whisper_available": whisper_loaded,
         }
 
-        if self.diarization_service.pipeline:
+        if pipeline:
             status["auth_token_configured"] = self.diarization_service.auth_token is not None
         else:
             status["error"] = "pyannote.audio not available or initialization failed"
 
-        return status
+        self._status_cache = status
+        self._status_key = key
+        return dict(status)
+
     def estimate_multi_speaker_heuristic(self, audio_path: Path) -> Dict[str, Any]:
         """
         Estimate if audio likely contains multiple speakers using duration-based heuristics.
@@ -163,7 +212,7 @@ class DiarizationRunner:
                 validation["duration_seconds"] = duration
 
         except Exception as e:
-            self.logger.warning(f"Could not apply multi-speaker heuristic: {e}")
+            logger.warning(f"Could not apply multi-speaker heuristic: {e}")
             validation["error"] = str(e)
 
         return validation
\ No newline at end of file
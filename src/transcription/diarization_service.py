@@ -6,22 +6,53 @@ transcription, integrating with WhisperX alignment results.
 """
 
 import logging
+import os
+import tempfile
+from itertools import repeat
+from operator import contains, itemgetter
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
+import orjson
 from datetime import datetime
 
 try:
     from pyannote.audio import Pipeline
     from pyannote.audio.pipelines.utils.hook import ProgressHook
+    import torch
     PYANNOTE_AVAILABLE = True
 except ImportError:
     PYANNOTE_AVAILABLE = False
     Pipeline = None
     ProgressHook = None
+    torch = None
+
+try:
+    import torchaudio.functional as torchaudio_functional
+    TORCHAUDIO_AVAILABLE = True
+except ImportError:
+    TORCHAUDIO_AVAILABLE = False
+    torchaudio_functional = None
 
 from .audio_loader import AudioLoader
+from .model_manager import DIARIZATION_MODEL, get_model_manager
 from ..models.transcript_segment import TranscriptSegment
+from ..utils.hashing import buffer_sha256, file_sha256
+
+logger = logging.getLogger(__name__)
+
+# Opt-in energy VAD used to skip the pyannote pipeline when there is no turn-taking
+VAD_FRAME_SECONDS = 0.03
+VAD_ENERGY_THRESHOLD = 0.01  # Minimum frame RMS, roughly -40 dBFS
+VAD_NOISE_PERCENTILE = 10  # Frame RMS percentile taken as the recording's noise floor
+VAD_NOISE_FLOOR_RATIO = 3.0  # Speech must be ~10 dB above the noise floor
+VAD_MIN_SILENCE_SECONDS = 0.3
+SINGLE_SPEAKER_LABEL = "SPEAKER_00"
+
+DEFAULT_CACHE_DIR = Path(".logs/diarization_cache")
+
+# pyannote's default of 32 overflows consumer GPUs; smaller batches stream instead of thrashing
+DEFAULT_PIPELINE_BATCH_SIZE = 8
 
 
 class DiarizationService:
@@ -32,7 +63,9 @@ class DiarizationService:
     to transcription segments for multi-speaker conversations.
     """
 
-    def __init__(self, auth_token: Optional[str] = None, min_speakers: int = 1, max_speakers: int = 10):
+    def __init__(self, auth_token: Optional[str] = None, min_speakers: int = 1, max_speakers: int = 10,
+                 segmentation_batch_size: Optional[int] = None, embedding_batch_size: Optional[int] = None,
+                 cache_dir: Optional[Path] = None, vad_precheck: Optional[bool] = None):
         """
         Initialize the diarization service.
 
@@ -40,23 +73,35 @@ class DiarizationService:
             auth_token: HuggingFace authentication token for pyannote models
             min_speakers: Minimum number of speakers to detect (default: 1)
             max_speakers: Maximum number of speakers to detect (default: 10)
+            segmentation_batch_size: pyannote segmentation batch size (default: tuned to GPU memory)
+            embedding_batch_size: pyannote embedding batch size (default: tuned to GPU memory)
+            cache_dir: Directory for cached diarization results
+                (default: LOREKEEPER_DIAR_CACHE or .logs/diarization_cache)
+            vad_precheck: Skip the pipeline when an energy VAD finds a single burst of speech.
+                The VAD cannot tell voices apart, so this is off unless enabled here or
+                with LOREKEEPER_DIAR_VAD_PRECHECK=1
         """
-        self.logger = logging.getLogger(self.__class__.__name__)
         self.auth_token = auth_token or self._get_auth_token()
         self.min_speakers = min_speakers
         self.max_speakers = max_speakers
+        self.segmentation_batch_size = segmentation_batch_size
+        self.embedding_batch_size = embedding_batch_size
+        self.cache_dir = Path(cache_dir or os.getenv("LOREKEEPER_DIAR_CACHE") or DEFAULT_CACHE_DIR)
+        if vad_precheck is None:
+            vad_precheck = os.getenv("LOREKEEPER_DIAR_VAD_PRECHECK", "").lower() in ("1", "true", "yes")
+        self.vad_precheck = vad_precheck
         self.pipeline: Optional[Pipeline] = None
         self.audio_loader = AudioLoader()
 
         if not PYANNOTE_AVAILABLE:
-            self.logger.warning("pyannote.audio not available. Speaker diarization will be disabled.")
+            logger.warning("pyannote.audio not available. Speaker diarization will be disabled.")
             return
 
         try:
             self._initialize_pipeline()
         except Exception as e:
-            self.logger.error(f"Failed to initialize diarization pipeline: {e}")
-            self.logger.warning("Speaker diarization will be unavailable")
+            logger.error(f"Failed to initialize diarization pipeline: {e}")
+            logger.warning("Speaker diarization will be unavailable")
 
     def _get_auth_token(self) -> Optional[str]:
         """Get HuggingFace authentication token from environment."""
@@ -68,13 +113,17 @@ class DiarizationService:
             raise ValueError("HuggingFace authentication token required for pyannote.audio. "
                            "Set HF_TOKEN or HUGGINGFACE_TOKEN environment variable.")
 
-        self.logger.info("Initializing pyannote diarization pipeline...")
+        logger.info("Initializing pyannote diarization pipeline...")
 
-        # Use the speaker diarization pipeline
-        self.pipeline = Pipeline.from_pretrained(
-            "pyannote/speaker-diarization-3.1",
-            use_auth_token=self.auth_token
-        )
+        # Shared with every other service in the process through the model manager
+        self.pipeline = get_model_manager().load_diarization_pipeline(self.auth_token, DIARIZATION_MODEL)
+
+        # Size inference batches to fit in GPU memory
+        default_batch_size = self._default_batch_size()
+        self.pipeline.segmentation_batch_size = self.segmentation_batch_size or default_batch_size
+        self.pipeline.embedding_batch_size = self.embedding_batch_size or default_batch_size
+        logger.info(f"Diarization batch sizes: segmentation={self.pipeline.segmentation_batch_size}, "
+                    f"embedding={self.pipeline.embedding_batch_size}")
 
         # Configure pipeline for better performance
         if hasattr(self.pipeline, 'parameters'):
@@ -82,7 +131,26 @@ class DiarizationService:
             self.pipeline.parameters.min_speakers = self.min_speakers
             self.pipeline.parameters.max_speakers = self.max_speakers  # Reasonable upper limit
 
-        self.logger.info("Diarization pipeline initialized successfully")
+        logger.info("Diarization pipeline initialized successfully")
+
+    def _default_batch_size(self) -> int:
+        """
+        Pick a pyannote batch size from available GPU memory.
+
+        Returns:
+            32 (pyannote's default) on GPUs with 16GB+ VRAM, 4 below 8GB,
+            otherwise DEFAULT_PIPELINE_BATCH_SIZE
+        """
+        if torch.cuda.is_available():
+            try:
+                gpu_memory = torch.cuda.get_device_properties(0).total_memory / (1024**3)  # GB
+                if gpu_memory >= 16.0:
+                    return 32
+                if gpu_memory < 8.0:
+                    return 4
+            except Exception as e:
+                logger.warning(f"Could not check GPU memory: {e}")
+        return DEFAULT_PIPELINE_BATCH_SIZE
 
     def diarize_audio(self, audio_path: Path) -> Optional[Dict[str, Any]]:
         """
@@ -95,38 +163,251 @@ class DiarizationService:
             Dictionary containing speaker segments or None if diarization fails
         """
         if not self.pipeline:
-            self.logger.warning("Diarization pipeline not available")
+            logger.warning("Diarization pipeline not available")
             return None
 
         try:
-            self.logger.info(f"Starting speaker diarization: {audio_path}")
+            logger.info(f"Starting speaker diarization: {audio_path}")
+
+            # A file seen before skips decoding as well as the pipeline
+            file_cache_path = self._cache_path(file_sha256(audio_path))
+            cached = self._load_cached_result(file_cache_path)
+            if cached is not None:
+                logger.info(f"Using cached diarization result: {file_cache_path}")
+                return cached
 
             # Load audio
             audio, sample_rate = self.audio_loader.load_audio(audio_path)
+        except Exception as e:
+            logger.error(f"Diarization failed for {audio_path}: {e}")
+            return None
+
+        return self._diarize_array(audio, sample_rate, file_cache_path)
+
+    def diarize_audio_array(self, audio: np.ndarray, sample_rate: int) -> Optional[Dict[str, Any]]:
+        """
+        Perform speaker diarization on already-decoded audio.
 
+        Args:
+            audio: Mono float32 audio array
+            sample_rate: Sample rate of the audio
+
+        Returns:
+            Dictionary containing speaker segments or None if diarization fails
+        """
+        if not self.pipeline:
+            logger.warning("Diarization pipeline not available")
+            return None
+
+        return self._diarize_array(audio, sample_rate)
+
+    def _diarize_array(self, audio: np.ndarray, sample_rate: int,
+                       file_cache_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+        """
+        Diarize decoded audio, caching only results produced by the pipeline.
+
+        Each entry point uses a single cache key: the file digest from diarize_audio,
+        or a digest of the samples for diarize_audio_array.
+
+        The single-speaker shortcut depends on vad_precheck and max_speakers, so its
+        result is returned without being cached.
+
+        Args:
+            audio: Mono float32 audio array
+            sample_rate: Sample rate of the audio
+            file_cache_path: Cache entry of the source file, already looked up by diarize_audio;
+                when None the entry is keyed on a hash of the decoded samples
+
+        Returns:
+            Dictionary containing speaker segments or None if diarization fails
+        """
+        try:
             # Convert to format expected by pyannote (mono, appropriate sample rate)
             if sample_rate != 16000:
-                # Resample if needed
-                audio = self.audio_loader.resample_audio(audio, sample_rate, 16000)
+                audio = self._resample_for_pipeline(audio, sample_rate, 16000)
                 sample_rate = 16000
 
-            # Create waveform dictionary as expected by pyannote
-            waveform = {"waveform": np.expand_dims(audio, 0), "sample_rate": sample_rate}
-
-            # Run diarization with progress hook
-            with ProgressHook() as hook:
+            # Skip the pipeline entirely when the audio cannot contain speaker turns
+            if self.is_single_speaker(audio, sample_rate):
+                logger.info("Single speaker detected, skipping diarization pipeline")
+                return {"segments": [
+                    {"start": 0.0, "end": len(audio) / sample_rate, "speaker": SINGLE_SPEAKER_LABEL}
+                ]}
+
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+
+            # Identical audio (e.g. a retried job) reuses the previous pipeline run
+            cache_path = file_cache_path
+            if cache_path is None:
+                cache_path = self._cache_path(buffer_sha256(audio))
+                cached = self._load_cached_result(cache_path)
+                if cached is not None:
+                    logger.info(f"Using cached diarization result: {cache_path}")
+                    return cached
+
+            # Only a cache miss pays for the upload
+            waveform = {"waveform": self._pipeline_waveform(audio), "sample_rate": sample_rate}
+
+            # Run diarization with progress hook, without autograd bookkeeping
+            with torch.inference_mode(), ProgressHook() as hook:
                 diarization = self.pipeline(waveform, hook=hook)
 
             # Convert to our format
             speaker_segments = self._convert_diarization_result(diarization)
 
-            self.logger.info(f"Diarization completed: found {len(set(seg['speaker'] for seg in speaker_segments))} speakers")
-            return {"segments": speaker_segments}
+            logger.info(f"Diarization completed: found {len(set(seg['speaker'] for seg in speaker_segments))} speakers")
+            result = {"segments": speaker_segments}
+            self._save_cached_result(cache_path, result)
+            return result
 
         except Exception as e:
-            self.logger.error(f"Diarization failed for {audio_path}: {e}")
+            logger.error(f"Diarization failed: {e}")
             return None
 
+    @staticmethod
+    def _pipeline_waveform(audio: np.ndarray) -> Any:
+        """
+        Build the (channel, time) waveform tensor pyannote expects, on the GPU when available.
+
+        The whole recording is copied to the device once, so pyannote slides its
+        windows over device memory instead of copying each segmentation and
+        embedding batch from the host.
+
+        Args:
+            audio: Contiguous mono float32 audio array
+
+        Returns:
+            Waveform tensor; on CPU it shares memory with audio
+        """
+        waveform_t = torch.from_numpy(audio).unsqueeze(0)
+        if torch.cuda.is_available():
+            waveform_t = waveform_t.to("cuda")
+        return waveform_t
+
+    def _resample_for_pipeline(self, audio: np.ndarray, original_rate: int, target_rate: int) -> np.ndarray:
+        """
+        Resample audio for the pipeline, on the GPU when torchaudio and CUDA are available.
+
+        The result is copied back to host memory because the single-speaker check and
+        the content-hash cache both operate on the numpy array.
+
+        Args:
+            audio: Mono float32 audio array
+            original_rate: Sample rate of the audio
+            target_rate: Sample rate the pipeline expects
+
+        Returns:
+            Resampled mono float32 audio array
+        """
+        if TORCHAUDIO_AVAILABLE and torch.cuda.is_available():
+            try:
+                with torch.inference_mode():
+                    audio_t = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32)).to("cuda")
+                    audio_t = torchaudio_functional.resample(
+                        audio_t, original_rate, target_rate, resampling_method="sinc_interp_kaiser"
+                    )
+                    return audio_t.cpu().numpy()
+            except Exception as e:
+                logger.warning(f"GPU resampling failed, falling back to CPU: {e}")
+
+        return self.audio_loader.resample_audio(audio, original_rate, target_rate)
+
+    def _cache_path(self, digest: str) -> Path:
+        """
+        Content-addressed cache path for a diarization result.
+
+        Keyed on a SHA-256 of the audio (file bytes or decoded samples), the
+        speaker bounds and the pipeline version.
+
+        Args:
+            digest: Hex SHA-256 of the audio content
+
+        Returns:
+            Path of the cached JSON result
+        """
+        version = DIARIZATION_MODEL.rsplit('-', 1)[-1]
+        return self.cache_dir / f"{digest}_{self.min_speakers}_{self.max_speakers}_v{version}.json"
+
+    def _load_cached_result(self, cache_path: Path) -> Optional[Dict[str, Any]]:
+        """Load a cached diarization result, or None on a miss or unreadable entry."""
+        try:
+            return orjson.loads(cache_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable diarization cache {cache_path}: {e}")
+            return None
+
+    def _save_cached_result(self, cache_path: Path, result: Dict[str, Any]) -> None:
+        """Atomically write a diarization result to the cache; failures are only logged."""
+        tmp_name = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(result))
+            os.replace(tmp_name, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not cache diarization result to {cache_path}: {e}")
+            if tmp_name:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def is_single_speaker(self, audio: np.ndarray, sample_rate: int) -> bool:
+        """
+        Decide from already-decoded audio whether diarization can be skipped.
+
+        True when at most one speaker is configured, or, with vad_precheck enabled,
+        when an energy VAD finds at most one continuous burst of speech (no pauses
+        where speakers could change).
+
+        Args:
+            audio: Mono float audio array
+            sample_rate: Sample rate of the audio
+
+        Returns:
+            True if the audio should be labelled as a single speaker
+        """
+        if self.max_speakers <= 1:
+            return True
+        if not self.vad_precheck:
+            return False
+        return self._count_speech_bursts(audio, sample_rate) <= 1
+
+    def _count_speech_bursts(self, audio: np.ndarray, sample_rate: int) -> int:
+        """
+        Count speech bursts separated by at least VAD_MIN_SILENCE_SECONDS of silence.
+
+        Frames count as speech when they are well above the recording's own noise
+        floor, so steady background noise does not merge everything into one burst.
+
+        Args:
+            audio: Mono float audio array
+            sample_rate: Sample rate of the audio
+
+        Returns:
+            Number of speech bursts
+        """
+        frame_length = int(sample_rate * VAD_FRAME_SECONDS)
+        num_frames = len(audio) // frame_length
+        if num_frames == 0:
+            return 0
+
+        frames = audio[:num_frames * frame_length].reshape(num_frames, frame_length)
+        rms = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
+        noise_floor = np.percentile(rms, VAD_NOISE_PERCENTILE)
+        threshold = max(VAD_ENERGY_THRESHOLD, VAD_NOISE_FLOOR_RATIO * noise_floor)
+        voiced = np.flatnonzero(rms > threshold)
+        if len(voiced) == 0:
+            return 0
+
+        # Unvoiced frames between consecutive voiced frames
+        gaps = np.diff(voiced) - 1
+        min_gap_frames = int(round(VAD_MIN_SILENCE_SECONDS / VAD_FRAME_SECONDS))
+        return 1 + int(np.count_nonzero(gaps >= min_gap_frames))
+
     def _convert_diarization_result(self, diarization) -> List[Dict[str, Any]]:
         """
         Convert pyannote diarization result to our segment format.
@@ -159,6 +440,9 @@ class DiarizationService:
         Creates new TranscriptSegment instances with speaker labels assigned based on
         temporal overlap with diarization results. Input segments are not modified.
 
+        Speaker turns are sorted once and each segment's candidate turns are located
+        with np.searchsorted, so only overlapping turns are examined per segment.
+
         Args:
             transcript_segments: List of transcript segments from WhisperX
             diarization_result: Diarization result with speaker segments
@@ -167,68 +451,78 @@ class DiarizationService:
             New list of TranscriptSegment instances with speaker labels assigned
         """
         if not diarization_result or "segments" not in diarization_result:
-            self.logger.warning("No diarization results available for speaker assignment")
+            logger.warning("No diarization results available for speaker assignment")
             return transcript_segments
 
-        speaker_segments = diarization_result["segments"]
-        updated_segments = []
-
-        for transcript_seg in transcript_segments:
-            # Find overlapping speaker segments
-            overlapping_speakers = self._find_overlapping_speakers(
-                transcript_seg.start_time,
-                transcript_seg.end_time,
-                speaker_segments
-            )
-
-            # Create a new segment with speaker label assigned
-            speaker_label = None
-            if overlapping_speakers:
-                # Assign the speaker with the most overlap
-                speaker_label = max(overlapping_speakers.items(), key=lambda x: x[1])[0]
+        turn_starts, turn_ends, turn_speakers, speaker_names = self._speaker_turn_arrays(
+            diarization_result["segments"]
+        )
+        num_turns = len(turn_starts)
 
-            # Create new TranscriptSegment instance to avoid mutating input
-            new_segment = TranscriptSegment(
-                start_time=transcript_seg.start_time,
-                end_time=transcript_seg.end_time,
-                text=transcript_seg.text,
-                speaker_label=speaker_label,
-                words=transcript_seg.words
-            )
+        num_segments = len(transcript_segments)
+        seg_starts = np.fromiter((seg.start_time for seg in transcript_segments), dtype=np.float64, count=num_segments)
+        seg_ends = np.fromiter((seg.end_time for seg in transcript_segments), dtype=np.float64, count=num_segments)
 
-            updated_segments.append(new_segment)
+        # Turns may overlap each other, so bound the left edge with the running max of
+        # turn ends: every turn before `first` ends at or before the segment starts.
+        reach = np.maximum.accumulate(turn_ends) if num_turns else turn_ends
+        first = np.searchsorted(reach, seg_starts, side="right")
+        last = np.searchsorted(turn_starts, seg_ends, side="left")
 
-        return updated_segments
+        speaker_labels = []
 
-    def _find_overlapping_speakers(self, start_time: float, end_time: float,
-                                 speaker_segments: List[Dict[str, Any]]) -> Dict[str, float]:
+        for i, j, seg_start, seg_end in zip(first, last, seg_starts, seg_ends):
+            speaker_label = None
+            if i < j:
+                overlap = np.minimum(turn_ends[i:j], seg_end) - np.maximum(turn_starts[i:j], seg_start)
+                np.maximum(overlap, 0, out=overlap)
+                # Total overlap per speaker; assign the speaker with the most overlap
+                totals = np.bincount(turn_speakers[i:j], weights=overlap, minlength=len(speaker_names))
+                best = int(totals.argmax())
+                if totals[best] > 0:
+                    window = turn_speakers[i:j]
+                    tied = (overlap > 0) & (totals[window] == totals[best])
+                    # On ties, prefer the speaker whose overlapping turn starts first
+                    speaker_label = speaker_names[window[tied.argmax()]]
+            speaker_labels.append(speaker_label)
+
+        # Create new TranscriptSegment instances to avoid mutating input
+        return [
+            TranscriptSegment(seg.start_time, seg.end_time, seg.text, speaker_label, seg.words)
+            for seg, speaker_label in zip(transcript_segments, speaker_labels)
+        ]
+
+    def _speaker_turn_arrays(self, speaker_segments: List[Dict[str, Any]]
+                             ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
         """
-        Find speakers that overlap with the given time range.
+        Materialize diarization turns as start-sorted NumPy arrays.
 
         Args:
-            start_time: Start time of the segment
-            end_time: End time of the segment
-            speaker_segments: List of speaker segments from diarization
+            speaker_segments: Speaker segments from diarization
 
         Returns:
-            Dictionary mapping speaker labels to overlap duration
+            Tuple of (starts, ends, integer speaker ids, speaker labels indexed by id)
         """
-        overlaps = {}
-
-        for speaker_seg in speaker_segments:
-            speaker_start = speaker_seg["start"]
-            speaker_end = speaker_seg["end"]
-            speaker_label = speaker_seg["speaker"]
-
-            # Calculate overlap
-            overlap_start = max(start_time, speaker_start)
-            overlap_end = min(end_time, speaker_end)
-            overlap_duration = max(0, overlap_end - overlap_start)
-
-            if overlap_duration > 0:
-                overlaps[speaker_label] = overlaps.get(speaker_label, 0) + overlap_duration
+        num_turns = len(speaker_segments)
+        starts = np.fromiter((turn["start"] for turn in speaker_segments), dtype=np.float64, count=num_turns)
+        ends = np.fromiter((turn["end"] for turn in speaker_segments), dtype=np.float64, count=num_turns)
+
+        # _convert_diarization_result already emits turns in start order; only sort if needed
+        if np.all(starts[1:] >= starts[:-1]):
+            order = range(num_turns)
+        else:
+            order = np.argsort(starts, kind="stable")
+            starts = starts[order]
+            ends = ends[order]
+
+        # Factorize labels with a dict in turn order (no string sort)
+        speaker_ids: Dict[str, int] = {}
+        ids = np.fromiter(
+            (speaker_ids.setdefault(speaker_segments[i]["speaker"], len(speaker_ids)) for i in order),
+            dtype=np.intp, count=num_turns
+        )
 
-        return overlaps
+        return starts, ends, ids, list(speaker_ids)
 
     def validate_diarization_result(self, diarization_result: Optional[Dict[str, Any]]) -> bool:
         """
@@ -247,14 +541,16 @@ class DiarizationService:
         if not segments:
             return False
 
-        # Check that segments have required fields and valid timing
-        for segment in segments:
-            if not all(key in segment for key in ["start", "end", "speaker"]):
-                return False
-            if segment["start"] >= segment["end"]:
-                return False
+        # Check that segments have required fields and valid timing, without a per-segment Python loop
+        try:
+            starts = np.fromiter(map(itemgetter("start"), segments), dtype=np.float64, count=len(segments))
+            ends = np.fromiter(map(itemgetter("end"), segments), dtype=np.float64, count=len(segments))
+        except (KeyError, TypeError, ValueError):
+            return False
+        if not all(map(contains, segments, repeat("speaker"))):
+            return False
 
-        return True
+        return bool((starts < ends).all())
 
     def get_speaker_summary(self, diarization_result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
@@ -3,30 +3,92 @@ Async Transcription Job Manager
 Handles background transcription jobs for Discord bot
 """
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Dict, Any
+import functools
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, Union
+
+GPU_MODE = "gpu"
+CPU_MODE = "cpu"
+
+# Finished jobs kept around for status and completion lookups before the oldest are dropped
+MAX_FINISHED_JOBS = 100
+
+
+def _init_cpu_worker() -> None:
+    """Import the transcription stack once per worker process instead of once per job."""
+    from . import whisper_runner  # noqa: F401
+
 
 class TranscriptionJobManager:
-    def __init__(self, max_workers: int = 4):
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.loop = asyncio.get_event_loop()
+    def __init__(self, max_workers: Optional[int] = None, mode: str = GPU_MODE,
+                 max_finished_jobs: int = MAX_FINISHED_JOBS):
+        """
+        Jobs are scheduled on whichever event loop is running when submit_job is called.
+
+        Args:
+            max_workers: Worker count (default: 1 in GPU mode, half the CPU cores in CPU mode)
+            mode: GPU_MODE runs callables on a single thread that owns the GPU and the shared
+                ModelManager; CPU_MODE runs them in worker processes for GIL-free parallelism
+                (callables and arguments must then be picklable)
+            max_finished_jobs: Finished jobs remembered before the oldest are dropped (default: 100)
+        """
+        if mode == GPU_MODE:
+            # A single worker owns the GPU; parallelism comes from the model's batch size, not worker count
+            self.executor: Executor = ThreadPoolExecutor(max_workers=max_workers or 1)
+        elif mode == CPU_MODE:
+            self.executor = ProcessPoolExecutor(
+                max_workers=max_workers or max(1, (os.cpu_count() or 2) // 2),
+                initializer=_init_cpu_worker,
+            )
+        else:
+            raise ValueError(f"Unknown job manager mode: {mode!r} (expected {GPU_MODE!r} or {CPU_MODE!r})")
+        self.mode = mode
+        # Strong references: the event loop only holds weak references to running tasks
         self.jobs: Dict[str, asyncio.Future] = {}
+        self.max_finished_jobs = max_finished_jobs
+        self._finished: deque = deque()
+        # Guards jobs against status lookups and cleanup from executor threads
+        self._lock = threading.Lock()
 
-    def submit_job(self, job_id: str, func: Callable, *args, **kwargs) -> asyncio.Future:
-        future = self.loop.run_in_executor(self.executor, func, *args, **kwargs)
-        self.jobs[job_id] = future
+    def submit_job(self, job_id: str, job: Union[Callable, Any], *args, **kwargs) -> asyncio.Future:
+        """Schedule a coroutine or callable on the running loop; must be called from within that loop."""
+        loop = asyncio.get_running_loop()
+        if asyncio.iscoroutine(job):
+            # Schedule coroutines directly on the running loop rather than spinning up a new one per job
+            future = loop.create_task(job)
+        else:
+            future = loop.run_in_executor(self.executor, functools.partial(job, *args, **kwargs))
+        with self._lock:
+            self.jobs[job_id] = future
+        future.add_done_callback(functools.partial(self._job_finished, job_id))
         return future
 
+    def _job_finished(self, job_id: str, future: asyncio.Future) -> None:
+        """Record a finished job and drop the oldest finished jobs beyond max_finished_jobs."""
+        with self._lock:
+            self._finished.append((job_id, future))
+            while len(self._finished) > self.max_finished_jobs:
+                old_id, old_future = self._finished.popleft()
+                # The id may have been resubmitted since; only drop the job that finished
+                if self.jobs.get(old_id) is old_future:
+                    del self.jobs[old_id]
+
     def get_job_status(self, job_id: str) -> str:
-        future = self.jobs.get(job_id)
+        with self._lock:
+            future = self.jobs.get(job_id)
         if not future:
             return "not_found"
         if future.done():
+            if future.cancelled():
+                return "cancelled"
             if future.exception():
                 return "failed"
             return "completed"
         return "running"
 
     def cleanup_job(self, job_id: str):
-        if job_id in self.jobs:
-            del self.jobs[job_id]
+        with self._lock:
+            self.jobs.pop(job_id, None)
@@ -5,12 +5,39 @@ Loads and validates session metadata JSON files, extracting relevant
 information for transcription processing and logging.
 """
 
-import json
 import logging
+import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+import orjson
+
+try:
+    from ciso8601 import parse_datetime
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+    parse_datetime = None
+
+# ISO-8601 parser: ciso8601's C parser if installed, else the stdlib
+# (which only understands a trailing 'Z' from Python 3.11)
+if CISO8601_AVAILABLE:
+    _parse_timestamp = parse_datetime
+elif sys.version_info >= (3, 11):
+    _parse_timestamp = datetime.fromisoformat
+else:
+    def _parse_timestamp(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+# Keys SessionRecorder writes to every session metadata file; session_id and audio_format
+# are optional and defaulted by extract_session_info
+RECOMMENDED_FIELDS = [
+    'guild_id', 'channel_id', 'participants', 'start_time',
+    'end_time', 'duration', 'file_path'
+]
+
 
 class MetadataParser:
     """
@@ -44,8 +71,8 @@ class MetadataParser:
         try:
             self.logger.info(f"Loading metadata from: {metadata_path}")
 
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            # orjson parses the raw bytes directly, skipping a separate UTF-8 decode
+            metadata = orjson.loads(metadata_path.read_bytes())
 
             # Validate metadata structure
             self._validate_metadata(metadata)
@@ -53,7 +80,7 @@ class MetadataParser:
             self.logger.info("Successfully loaded and validated metadata")
             return metadata
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             error_msg = f"Invalid JSON in metadata file {metadata_path}: {e}"
             self.logger.error(error_msg)
             raise ValueError(error_msg) from e
@@ -78,13 +105,8 @@ class MetadataParser:
         # Check for essential fields (these may vary based on session format)
         # For now, we'll be permissive but log warnings for missing fields
 
-        recommended_fields = [
-            'session_id', 'start_time', 'end_time', 'guild_id',
-            'channel_id', 'participants', 'audio_format'
-        ]
-
         missing_fields = []
-        for field in recommended_fields:
+        for field in RECOMMENDED_FIELDS:
             if field not in metadata:
                 missing_fields.append(field)
 
@@ -96,8 +118,8 @@ class MetadataParser:
             if time_field in metadata:
                 try:
                     # Try to parse as ISO datetime
-                    datetime.fromisoformat(metadata[time_field].replace('Z', '+00:00'))
-                except (ValueError, AttributeError):
+                    _parse_timestamp(metadata[time_field])
+                except (ValueError, AttributeError, TypeError):
                     self.logger.warning(f"Invalid timestamp format for {time_field}: {metadata[time_field]}")
 
     def extract_session_info(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
@@ -110,15 +132,17 @@ class MetadataParser:
         Returns:
             Dictionary with extracted session information
         """
+        start_time = metadata.get('start_time')
+        end_time = metadata.get('end_time')
         session_info = {
             'session_id': metadata.get('session_id', 'unknown'),
             'guild_id': metadata.get('guild_id'),
             'channel_id': metadata.get('channel_id'),
             'participants': metadata.get('participants', []),
-            'start_time': metadata.get('start_time'),
-            'end_time': metadata.get('end_time'),
+            'start_time': start_time,
+            'end_time': end_time,
             'audio_format': metadata.get('audio_format', {}),
-            'duration_seconds': self._calculate_duration(metadata)
+            'duration_seconds': self._duration_between(start_time, end_time)
         }
 
         return session_info
@@ -133,13 +157,15 @@ class MetadataParser:
         Returns:
             Duration in seconds or None if cannot calculate
         """
-        try:
-            start_time = metadata.get('start_time')
-            end_time = metadata.get('end_time')
+        return self._duration_between(metadata.get('start_time'), metadata.get('end_time'))
 
+    @staticmethod
+    def _duration_between(start_time: Any, end_time: Any) -> Optional[float]:
+        """Duration in seconds between two ISO timestamps, or None if either is missing or invalid."""
+        try:
             if start_time and end_time:
-                start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+                start_dt = _parse_timestamp(start_time)
+                end_dt = _parse_timestamp(end_time)
                 return (end_dt - start_dt).total_seconds()
 
         except (ValueError, AttributeError, TypeError):
@@ -157,19 +183,24 @@ class MetadataParser:
         Returns:
             Dictionary with transcription context
         """
+        participants = metadata.get('participants', [])
+        audio_format = metadata.get('audio_format', {})
         context = {
-            'expected_speakers': len(metadata.get('participants', [])),
-            'audio_channels': metadata.get('audio_format', {}).get('channels', 1),
-            'audio_sample_rate': metadata.get('audio_format', {}).get('sample_rate', 16000),
+            'expected_speakers': len(participants),
+            'audio_channels': audio_format.get('channels', 1),
+            'audio_sample_rate': audio_format.get('sample_rate', 16000),
             'session_type': metadata.get('session_type', 'voice_channel'),
             'language': metadata.get('language', 'en'),  # Default to English
         }
 
-        # Add participant info for potential speaker mapping
-        participants = metadata.get('participants', [])
+        # Add participant info for potential speaker mapping, in a single pass
         if participants:
-            context['participant_ids'] = [p.get('user_id') for p in participants if isinstance(p, dict)]
-            context['participant_names'] = [p.get('username', p.get('name', 'Unknown'))
-                                          for p in participants if isinstance(p, dict)]
+            participant_ids, participant_names = [], []
+            for p in participants:
+                if isinstance(p, dict):
+                    participant_ids.append(p.get('user_id'))
+                    participant_names.append(p['username'] if 'username' in p else p.get('name', 'Unknown'))
+            context['participant_ids'] = participant_ids
+            context['participant_names'] = participant_names
 
         return context
\ No newline at end of file
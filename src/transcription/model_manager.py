@@ -6,8 +6,9 @@ CPU fallback, providing a clean interface for model operations.
 """
 
 import logging
+import threading
 import torch
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 import gc
 
 try:
@@ -17,6 +18,19 @@ except ImportError:
     WHISPERX_AVAILABLE = False
     whisperx = None
 
+try:
+    from pyannote.audio import Pipeline
+except ImportError:
+    Pipeline = None
+
+DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"
+
+# Unquantized compute types to retry with when the device rejects an int8 default
+FALLBACK_COMPUTE_TYPES = {"cuda": "float16", "cpu": "float32"}
+
+# One second of 16kHz audio, run once through a compiled alignment model to force compilation
+ALIGN_WARMUP_SAMPLES = 16000
+
 
 class ModelManager:
     """
@@ -30,8 +44,42 @@ class ModelManager:
         """Initialize the model manager."""
         self.logger = logging.getLogger(self.__class__.__name__)
         self.loaded_models: Dict[str, Any] = {}
+        # One load lock per cache key, so a slow load never blocks loads of other models
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._load_locks_guard = threading.Lock()
         self._check_whisperx_availability()
 
+    def _key_lock(self, cache_key: str) -> threading.Lock:
+        """Return the load lock for a cache key, creating it on first use."""
+        with self._load_locks_guard:
+            lock = self._load_locks.get(cache_key)
+            if lock is None:
+                lock = self._load_locks[cache_key] = threading.Lock()
+            return lock
+
+    def warm_model(self, model_name: str, compute_type: Optional[str] = None) -> None:
+        """
+        Load a WhisperX model on a background thread so the first transcription
+        doesn't pay the 10-15s load.
+
+        Callers pass the exact model and compute type they will later request, so the
+        warmed model is the one that gets used. load_model's per-model lock stops a
+        concurrent request loading it twice.
+
+        Args:
+            model_name: Name of the WhisperX model to load
+            compute_type: CTranslate2 compute type, as later passed to load_model
+        """
+        threading.Thread(target=self._warm_model, args=(model_name, compute_type),
+                         name="model-warmup", daemon=True).start()
+
+    def _warm_model(self, model_name: str, compute_type: Optional[str]) -> None:
+        """Background warm-up target; failures are left for the real load to report."""
+        try:
+            self.load_model(model_name, compute_type)
+        except Exception as e:
+            self.logger.warning(f"Background model warm-up failed: {e}")
+
     def _check_whisperx_availability(self) -> None:
         """Check if WhisperX is available and log status."""
         if not WHISPERX_AVAILABLE:
@@ -68,12 +116,43 @@ class ModelManager:
         else:
             return "cpu", torch.float32
 
-    def load_model(self, model_name: str = "large-v3") -> Any:
+    def _get_compute_type(self, device: str, compute_type: Optional[str] = None) -> str:
+        """
+        Resolve the CTranslate2 compute type for the WhisperX model.
+
+        Defaults to int8 weights, which halve memory traffic versus float16:
+        "int8_float16" on CUDA GPUs with int8 Tensor Cores (compute capability
+        7.5+) or under 8GB of VRAM, "float16" on other GPUs, and "int8" on CPU.
+
+        Args:
+            device: Device the model will run on
+            compute_type: Explicit compute type override
+
+        Returns:
+            CTranslate2 compute type string
+        """
+        if compute_type:
+            return compute_type
+        if device != "cuda":
+            return "int8"
+        try:
+            if torch.cuda.get_device_capability() >= (7, 5):
+                return "int8_float16"
+            # Older GPUs gain little speed from int8, but small ones need the memory headroom
+            if torch.cuda.get_device_properties(0).total_memory / (1024**3) < 8.0:
+                return "int8_float16"
+        except Exception as e:
+            self.logger.warning(f"Could not check GPU capabilities: {e}")
+        return "float16"
+
+    def load_model(self, model_name: str = "large-v3", compute_type: Optional[str] = None) -> Any:
         """
         Load a WhisperX model with optimal device configuration.
 
         Args:
             model_name: Name of the WhisperX model to load
+            compute_type: CTranslate2 compute type (default: int8_float16 on CUDA 7.5+ or under 8GB VRAM,
+                float16 on other GPUs, int8 on CPU; falls back to float16/float32 if int8 is unsupported)
 
         Returns:
             Loaded WhisperX model
@@ -81,26 +160,50 @@ class ModelManager:
         Raises:
             RuntimeError: If model loading fails
         """
-        if model_name in self.loaded_models:
-            self.logger.info(f"Using cached model: {model_name}")
-            return self.loaded_models[model_name]
+        device, _ = self._get_device_and_dtype()
+        resolved_type = self._get_compute_type(device, compute_type)
+        # The same model at a different compute type is a different model
+        cache_key = self._whisper_cache_key(model_name, resolved_type)
 
-        try:
-            device, dtype = self._get_device_and_dtype()
-
-            self.logger.info(f"Loading WhisperX model '{model_name}' on {device}")
+        if cache_key in self.loaded_models:
+            self.logger.info(f"Using cached model: {model_name} ({resolved_type})")
+            return self.loaded_models[cache_key]
 
-            # Load the model
-            model = whisperx.load_model(
-                model_name,
-                device=device,
-                compute_type="float16" if dtype == torch.float16 else "float32",
-                language="en",  # Default to English for Discord voice
-                asr_options={"suppress_tokens": []}  # Don't suppress any tokens
-            )
+        with self._key_lock(cache_key):
+            # Another thread may have finished loading while we waited
+            if cache_key in self.loaded_models:
+                return self.loaded_models[cache_key]
+            return self._load_model_locked(model_name, device, resolved_type, compute_type, cache_key)
+
+    @staticmethod
+    def _whisper_cache_key(model_name: str, compute_type: str) -> str:
+        """Cache key for a WhisperX model loaded at a given compute type."""
+        return f"whisperx_{model_name}_{compute_type}"
+
+    def _whisper_cache_keys(self, model_name: str) -> List[str]:
+        """Cache keys of every loaded compute-type variant of a WhisperX model."""
+        prefix = f"whisperx_{model_name}_"
+        return [key for key in self.loaded_models if key.startswith(prefix)]
+
+    def _load_model_locked(self, model_name: str, device: str, compute_type: str,
+                           requested_type: Optional[str], cache_key: str) -> Any:
+        """Load and cache a WhisperX model. Caller must hold the key's load lock."""
+        try:
+            self.logger.info(f"Loading WhisperX model '{model_name}' on {device} ({compute_type})")
 
-            # Cache the model
-            self.loaded_models[model_name] = model
+            try:
+                model = self._create_whisperx_model(model_name, device, compute_type)
+            except ValueError as e:
+                # CTranslate2 rejects int8 types the device or build cannot run efficiently
+                fallback_type = FALLBACK_COMPUTE_TYPES[device]
+                if requested_type or compute_type == fallback_type:
+                    raise
+                self.logger.warning(f"Compute type {compute_type} unsupported ({e}); retrying with {fallback_type}")
+                model = self._create_whisperx_model(model_name, device, fallback_type)
+
+            # Cache the model under the requested (or default) compute type, even after a fallback,
+            # so later requests for the same configuration hit the cache
+            self.loaded_models[cache_key] = model
 
             self.logger.info(f"Successfully loaded model '{model_name}'")
             return model
@@ -110,6 +213,17 @@ class ModelManager:
             self.logger.error(error_msg)
             raise RuntimeError(error_msg) from e
 
+    @staticmethod
+    def _create_whisperx_model(model_name: str, device: str, compute_type: str) -> Any:
+        """Create a WhisperX model with the bot's transcription defaults."""
+        return whisperx.load_model(
+            model_name,
+            device=device,
+            compute_type=compute_type,
+            language="en",  # Default to English for Discord voice
+            asr_options={"suppress_tokens": []}  # Don't suppress any tokens
+        )
+
     def load_align_model(self, language_code: str = "en") -> Any:
         """
         Load WhisperX alignment model for precise timestamping.
@@ -125,6 +239,13 @@ class ModelManager:
         if cache_key in self.loaded_models:
             return self.loaded_models[cache_key]
 
+        with self._key_lock(cache_key):
+            if cache_key in self.loaded_models:
+                return self.loaded_models[cache_key]
+            return self._load_align_model_locked(language_code, cache_key)
+
+    def _load_align_model_locked(self, language_code: str, cache_key: str) -> Any:
+        """Load and cache a WhisperX alignment model. Caller must hold the key's load lock."""
         try:
             device, _ = self._get_device_and_dtype()
 
@@ -135,6 +256,9 @@ class ModelManager:
                 device=device
             )
 
+            if device == "cuda":
+                align_model = self._compile_align_model(align_model)
+
             # Cache both model and metadata
             self.loaded_models[cache_key] = (align_model, metadata)
 
@@ -146,28 +270,126 @@ class ModelManager:
             self.logger.error(error_msg)
             raise RuntimeError(error_msg) from e
 
+    def load_diarization_pipeline(self, auth_token: str, model_name: str = DIARIZATION_MODEL) -> Any:
+        """
+        Load a pyannote diarization pipeline on the best available device.
+
+        The pipeline is cached under a stable key so every DiarizationService in the
+        process shares one device-resident copy. Callers configure batch sizes and
+        speaker limits on the returned pipeline.
+
+        Args:
+            auth_token: HuggingFace authentication token for pyannote models
+            model_name: pyannote pipeline to load
+
+        Returns:
+            Loaded pyannote Pipeline
+
+        Raises:
+            RuntimeError: If pipeline loading fails
+        """
+        cache_key = f"pyannote_diarization_{model_name}"
+
+        if cache_key in self.loaded_models:
+            return self.loaded_models[cache_key]
+
+        with self._key_lock(cache_key):
+            if cache_key in self.loaded_models:
+                return self.loaded_models[cache_key]
+            return self._load_diarization_pipeline_locked(auth_token, model_name, cache_key)
+
+    def _load_diarization_pipeline_locked(self, auth_token: str, model_name: str, cache_key: str) -> Any:
+        """Load and cache a pyannote pipeline. Caller must hold the key's load lock."""
+        if Pipeline is None:
+            raise RuntimeError("pyannote.audio is not installed. Install with: pip install pyannote.audio")
+
+        try:
+            self.logger.info(f"Loading diarization pipeline '{model_name}'")
+            pipeline = Pipeline.from_pretrained(model_name, use_auth_token=auth_token)
+
+            # pyannote stays on CPU unless moved explicitly; keep it resident on the GPU
+            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            pipeline.to(device)
+
+            self.loaded_models[cache_key] = pipeline
+
+            self.logger.info(f"Successfully loaded diarization pipeline on {device}")
+            return pipeline
+
+        except Exception as e:
+            error_msg = f"Failed to load diarization pipeline '{model_name}': {e}"
+            self.logger.error(error_msg)
+            raise RuntimeError(error_msg) from e
+
+    def _compile_align_model(self, align_model: Any) -> Any:
+        """
+        Compile the wav2vec2 alignment model to cut per-segment launch overhead.
+
+        Alignment runs the model once per transcript segment at batch size 1, so
+        kernel launch overhead dominates; inductor's fused kernels reduce the number
+        of launches. The default mode is used rather than "reduce-overhead": segment
+        lengths vary, and WhisperX feeds them unpadded, so CUDA graphs would be
+        re-recorded for almost every segment. dynamic=True compiles one graph for all
+        lengths. torch.compile is lazy, so a warm-up forward pass on a short silent
+        waveform forces compilation here; if that fails, the eager model is used
+        instead of failing the first alignment job.
+
+        Args:
+            align_model: Loaded alignment model
+
+        Returns:
+            Compiled alignment model, or the original model if compilation is unavailable or fails
+        """
+        if not hasattr(torch, "compile"):
+            return align_model
+
+        try:
+            compiled = torch.compile(align_model, dynamic=True)
+            warmup = torch.zeros(1, ALIGN_WARMUP_SAMPLES, device="cuda")
+            with torch.inference_mode():
+                compiled(warmup)
+            self.logger.info("Compiled alignment model with torch.compile")
+            return compiled
+        except Exception as e:
+            self.logger.warning(f"Could not compile alignment model, using eager mode: {e}")
+            return align_model
+
     def unload_model(self, model_name: str) -> None:
         """
-        Unload a cached model to free memory.
+        Drop a cached model so its memory can be reused.
+
+        The freed memory stays in PyTorch's caching allocator; call flush_caches()
+        (or unload_all_models()) to hand it back to the driver.
 
         Args:
-            model_name: Name of the model to unload
+            model_name: Name of the model to unload; a WhisperX model name unloads
+                every compute-type variant of it
         """
-        if model_name in self.loaded_models:
-            del self.loaded_models[model_name]
+        keys = [model_name] if model_name in self.loaded_models else self._whisper_cache_keys(model_name)
+        for key in keys:
+            if self._drop_reference(key):
+                self.logger.info(f"Unloaded model: {key}")
 
-            # Force garbage collection
-            gc.collect()
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+    def _drop_reference(self, model_name: str) -> bool:
+        """Remove a model from the cache without touching the allocator. Returns True if it was cached."""
+        return self.loaded_models.pop(model_name, None) is not None
 
-            self.logger.info(f"Unloaded model: {model_name}")
+    def flush_caches(self) -> None:
+        """
+        Collect garbage and release cached CUDA memory.
+
+        empty_cache() synchronizes the device and stalls in-flight work, so this is
+        reserved for shutdown or measured memory pressure rather than every unload.
+        """
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
 
     def unload_all_models(self) -> None:
-        """Unload all cached models."""
-        model_names = list(self.loaded_models.keys())
-        for name in model_names:
-            self.unload_model(name)
+        """Unload all cached models and release their memory in a single flush."""
+        for name in list(self.loaded_models.keys()):
+            self._drop_reference(name)
+        self.flush_caches()
 
         self.logger.info("Unloaded all cached models")
 
@@ -181,10 +403,11 @@ class ModelManager:
         Returns:
             Dictionary with model information or None if not loaded
         """
-        if model_name not in self.loaded_models:
+        keys = [model_name] if model_name in self.loaded_models else self._whisper_cache_keys(model_name)
+        if not keys:
             return None
 
-        model = self.loaded_models[model_name]
+        model = self.loaded_models[keys[0]]
 
         # Basic info - this will vary based on model type
         info = {
@@ -202,11 +425,15 @@ class ModelManager:
 
 # Global model manager instance
 _model_manager: Optional[ModelManager] = None
+_model_manager_lock = threading.Lock()
 
 
 def get_model_manager() -> ModelManager:
     """Get the global model manager instance."""
     global _model_manager
     if _model_manager is None:
-        _model_manager = ModelManager()
+        with _model_manager_lock:
+            # Another thread may have created it while we waited
+            if _model_manager is None:
+                _model_manager = ModelManager()
     return _model_manager
\ No newline at end of file
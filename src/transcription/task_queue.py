@@ -3,11 +3,34 @@ Async Transcription Task Queue
 Queues transcription jobs for background processing
 """
 import asyncio
-from typing import Any, Dict
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .async_processor import get_async_processor
+
+logger = logging.getLogger(__name__)
+
 
 class TranscriptionTaskQueue:
-    def __init__(self):
+    """
+    Two-stage pipeline: a decode stage prefetches audio for upcoming jobs on the I/O
+    pool while the inference stage transcribes the current one, so the GPU does not
+    sit idle during decoding and resampling.
+    """
+    MAX_BATCH = 8
+    PREFETCH_DEPTH = 2
+
+    def __init__(self, transcription_service=None, max_batch: int = MAX_BATCH,
+                 prefetch_depth: int = PREFETCH_DEPTH):
         self.queue = asyncio.Queue()
+        # Bounded so decoding never runs more than prefetch_depth jobs ahead of inference
+        self.decoded_queue = asyncio.Queue(maxsize=prefetch_depth)
+        self.transcription_service = transcription_service
+        self.max_batch = max_batch
+        # Decoding ahead only pays off when the service's loader keeps the decoded audio
+        self.audio_loader = getattr(transcription_service, "audio_loader", None)
+        self._workers: List[asyncio.Task] = []
 
     async def add_task(self, task: Dict[str, Any]):
         await self.queue.put(task)
@@ -17,3 +40,97 @@ class TranscriptionTaskQueue:
 
     def task_done(self):
         self.queue.task_done()
+
+    async def submit(self, job_id: str, audio_path: Path, metadata_path: Optional[Path] = None) -> asyncio.Future:
+        """
+        Queue an audio file for transcription by the shared background workers.
+
+        Returns a future that resolves to the TranscriptionService result.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.add_task({
+            "job_id": job_id,
+            "audio_path": audio_path,
+            "metadata_path": metadata_path,
+            "future": future,
+        })
+        self.start()
+        return future
+
+    def start(self) -> None:
+        """Start the decode and inference workers if they are not already running."""
+        if self._workers and not any(worker.done() for worker in self._workers):
+            return
+        for worker in self._workers:
+            worker.cancel()
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._decode_worker()),
+            loop.create_task(self._inference_worker()),
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the background workers."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        """Wait for one task, then take up to max_batch tasks that are already queued."""
+        batch = [await self.get_task()]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    @staticmethod
+    def _task_duration(task: Dict[str, Any]) -> int:
+        """Approximate audio duration by file size (all session audio is 16kHz mono PCM)."""
+        try:
+            return Path(task["audio_path"]).stat().st_size
+        except OSError:
+            return 0
+
+    def _prefetch_audio(self, audio_path: Path) -> None:
+        """Decode audio ahead of inference; the loader's decoded-audio cache lets the inference stage memory-map it."""
+        try:
+            self.audio_loader.load_audio(Path(audio_path))
+        except Exception as e:
+            # The inference stage reports the failure against the job
+            logger.debug(f"Prefetch failed for {audio_path}: {e}")
+
+    async def _decode_worker(self) -> None:
+        """Order queued jobs shortest-first and decode each before handing it to inference."""
+        processor = get_async_processor()
+        while True:
+            batch = await self._next_batch()
+            batch.sort(key=self._task_duration)
+            logger.info(f"Processing transcription batch of {len(batch)} job(s)")
+
+            prefetch = self.audio_loader is not None and self.audio_loader.cache_decoded
+            for task in batch:
+                if prefetch:
+                    await processor.run_io_task(self._prefetch_audio, task["audio_path"])
+                await self.decoded_queue.put(task)
+
+    async def _inference_worker(self) -> None:
+        """Run decoded jobs one at a time through the shared warm model."""
+        while True:
+            task = await self.decoded_queue.get()
+            future = task["future"]
+            try:
+                result = await self.transcription_service.transcribe_audio(
+                    task["audio_path"], task.get("metadata_path")
+                )
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"Transcription job {task['job_id']} failed: {e}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.decoded_queue.task_done()
+                self.task_done()
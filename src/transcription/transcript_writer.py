@@ -5,15 +5,68 @@ Handles formatting and saving transcription results to JSON files
 with proper schema validation and error handling.
 """
 
-import json
 import logging
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+import orjson
+
 from ..models.transcript_segment import TranscriptSegment
 from ..models.transcription_log import TranscriptionLog
 
+# WhisperX hands back NumPy scalars, and session metadata may carry integer keys
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Serialized segments are joined and written in groups to cut per-write overhead
+SEGMENT_WRITE_CHUNK = 256
+SEGMENT_SEPARATOR = b',\n    '
+# Larger than the 8 KiB default so long transcripts reach the disk in few write() syscalls
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+def write_json_file(path: Path, data: Any) -> None:
+    """Serialize data as indented JSON and write it with a single write() call."""
+    path.write_bytes(orjson.dumps(data, option=JSON_OPTIONS | orjson.OPT_INDENT_2))
+
+
+_SEGMENT_FIELDS = attrgetter("start_time", "end_time", "text", "speaker_label", "words")
+_WORD_FIELDS = attrgetter("word", "start", "end", "confidence")
+_END_TIME = attrgetter("end_time")
+
+
+def segment_to_dict(segment: TranscriptSegment) -> Dict[str, Any]:
+    """Convert a TranscriptSegment to a plain dictionary, word alignments included."""
+    segment_dict = _segment_json_dict(segment)
+    if "words" in segment_dict:
+        segment_dict["words"] = [
+            {"word": word, "start": start, "end": end, "confidence": confidence}
+            for word, start, end, confidence in map(_WORD_FIELDS, segment_dict["words"])
+        ]
+    return segment_dict
+
+
+def _segment_json_dict(segment: TranscriptSegment) -> Dict[str, Any]:
+    """
+    Convert a TranscriptSegment to the dictionary that is serialized to disk.
+
+    Word alignments stay WordAlignment dataclasses, which orjson serializes directly,
+    so this form is only for the writer and never handed to callers.
+    """
+    start_time, end_time, text, speaker_label, words = _SEGMENT_FIELDS(segment)
+    segment_dict = {"start_time": start_time, "end_time": end_time, "text": text}
+
+    # Add speaker label if available
+    if speaker_label is not None:
+        segment_dict["speaker_label"] = speaker_label
+
+    # Add word alignments if available
+    if words:
+        segment_dict["words"] = words
+
+    return segment_dict
+
 
 class TranscriptWriter:
     """
@@ -30,15 +83,22 @@ class TranscriptWriter:
     def write_transcript(self, segments: List[TranscriptSegment],
                         log: TranscriptionLog,
                         output_path: Path,
-                        session_info: Optional[Dict[str, Any]] = None) -> Path:
+                        session_info: Optional[Dict[str, Any]] = None,
+                        segment_dicts: Optional[List[Dict[str, Any]]] = None) -> Path:
         """
         Write transcription results to a JSON file.
 
+        Segments are serialized and written one at a time rather than building the
+        whole transcript in memory first. Output goes to a temporary file that
+        replaces output_path only once every segment has been validated.
+
         Args:
             segments: List of transcript segments
             log: Transcription log entry
             output_path: Path where to save the transcript
             session_info: Optional session metadata
+            segment_dicts: Segments already converted to their JSON dictionary form,
+                serialized as-is instead of converting segments again
 
         Returns:
             Path to the written file
@@ -53,15 +113,38 @@ class TranscriptWriter:
             # Create output directory if it doesn't exist
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Build transcript data structure
-            transcript_data = self._build_transcript_data(segments, log, session_info)
-
-            # Validate data before writing
-            self._validate_transcript_data(transcript_data)
-
-            # Write to file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(transcript_data, f, indent=2, ensure_ascii=False)
+            # Build and validate everything except the segments up front
+            metadata = self._build_metadata(segments, log)
+            log_data = self._build_log_data(log)
+            self._validate_transcript_data({"metadata": metadata, "segments": [], "log": log_data})
+
+            # Stream segments to a temporary file, validating each as it is written
+            temp_path = output_path.with_name(output_path.name + ".tmp")
+            try:
+                with open(temp_path, 'wb', buffering=WRITE_BUFFER_BYTES) as f:
+                    f.write(b'{\n  "metadata": ')
+                    f.write(orjson.dumps(metadata, option=JSON_OPTIONS))
+                    f.write(b',\n  "segments": [')
+                    chunk = []
+                    if segment_dicts is None:
+                        segment_dicts = map(_segment_json_dict, segments)
+                    for i, segment_dict in enumerate(segment_dicts):
+                        self._validate_segment_data(i, segment_dict)
+                        chunk.append(orjson.dumps(segment_dict, option=JSON_OPTIONS))
+                        if len(chunk) == SEGMENT_WRITE_CHUNK or i == len(segments) - 1:
+                            first_chunk = i < SEGMENT_WRITE_CHUNK
+                            f.write((b'\n    ' if first_chunk else SEGMENT_SEPARATOR) + SEGMENT_SEPARATOR.join(chunk))
+                            chunk.clear()
+                    f.write(b'\n  ],\n  "log": ')
+                    f.write(orjson.dumps(log_data, option=JSON_OPTIONS))
+                    if session_info:
+                        f.write(b',\n  "session": ')
+                        f.write(orjson.dumps(session_info, option=JSON_OPTIONS))
+                    f.write(b'\n}\n')
+                temp_path.replace(output_path)
+            finally:
+                if temp_path.exists():
+                    temp_path.unlink()
 
             self.logger.info(f"Successfully wrote transcript with {len(segments)} segments")
             return output_path
@@ -71,87 +154,28 @@ class TranscriptWriter:
             self.logger.error(error_msg)
             raise IOError(error_msg) from e
 
-    def _build_transcript_data(self, segments: List[TranscriptSegment],
-                             log: TranscriptionLog,
-                             session_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """
-        Build the complete transcript data structure.
-
-        Args:
-            segments: Transcript segments
-            log: Transcription log
-            session_info: Optional session information
-
-        Returns:
-            Complete transcript data dictionary
-        """
-        # Convert segments to dictionaries
-        segments_data = []
-        for segment in segments:
-            segment_dict = {
-                "start_time": segment.start_time,
-                "end_time": segment.end_time,
-                "text": segment.text
-            }
-
-            # Add speaker label if available
-            if segment.speaker_label is not None:
-                segment_dict["speaker_label"] = segment.speaker_label
-
-            # Add word alignments if available
-            if segment.words:
-                segment_dict["words"] = [
-                    {
-                        "word": word.word,
-                        "start": word.start,
-                        "end": word.end,
-                        "confidence": word.confidence
-                    }
-                    for word in segment.words
-                ]
-
-            segments_data.append(segment_dict)
-
-        # Build main transcript structure
-        transcript_data = {
-            "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "format_version": "1.0",
-                "transcription_model": log.model_name,
-                "total_segments": len(segments),
-                "total_duration": self._calculate_total_duration(segments)
-            },
-            "segments": segments_data,
-            "log": {
-                "timestamp": log.timestamp,
-                "runtime_seconds": log.runtime,
-                "model_name": log.model_name,
-                "accuracy_metrics": log.accuracy_metrics,
-                "errors": log.errors,
-                "successful": log.was_successful
-            }
+    def _build_metadata(self, segments: List[TranscriptSegment], log: TranscriptionLog) -> Dict[str, Any]:
+        """Build the transcript metadata block."""
+        return {
+            "created_at": datetime.now(),  # orjson writes datetimes as ISO 8601 natively
+            "format_version": "1.0",
+            "transcription_model": log.model_name,
+            "total_segments": len(segments),
+            # Single C-level pass; the metadata precedes the segments in the file, so this
+            # cannot be folded into the streaming loop without reordering the output
+            "total_duration": max(map(_END_TIME, segments), default=0.0)
         }
 
-        # Add session info if provided
-        if session_info:
-            transcript_data["session"] = session_info
-
-        return transcript_data
-
-    def _calculate_total_duration(self, segments: List[TranscriptSegment]) -> float:
-        """
-        Calculate total duration from segments.
-
-        Args:
-            segments: List of transcript segments
-
-        Returns:
-            Total duration in seconds
-        """
-        if not segments:
-            return 0.0
-
-        return max(segment.end_time for segment in segments)
+    def _build_log_data(self, log: TranscriptionLog) -> Dict[str, Any]:
+        """Build the transcript log block."""
+        return {
+            "timestamp": log.timestamp,
+            "runtime_seconds": log.runtime,
+            "model_name": log.model_name,
+            "accuracy_metrics": log.accuracy_metrics,
+            "errors": log.errors,
+            "successful": log.was_successful
+        }
 
     def _validate_transcript_data(self, data: Dict[str, Any]) -> None:
         """
@@ -180,27 +204,41 @@ class TranscriptWriter:
             raise ValueError("Segments must be a list")
 
         for i, segment in enumerate(segments):
-            if not isinstance(segment, dict):
-                raise ValueError(f"Segment {i} must be a dictionary")
-
-            required_segment_keys = ["start_time", "end_time", "text"]
-            for key in required_segment_keys:
-                if key not in segment:
-                    raise ValueError(f"Segment {i} missing required key: {key}")
-
-            # Validate timing
-            start_time = segment["start_time"]
-            end_time = segment["end_time"]
-            if not isinstance(start_time, (int, float)) or not isinstance(end_time, (int, float)):
-                raise ValueError(f"Segment {i} has invalid timing values")
-            if start_time >= end_time:
-                raise ValueError(f"Segment {i} start_time >= end_time")
+            self._validate_segment_data(i, segment)
 
         # Validate log
         log = data["log"]
         if not isinstance(log.get("runtime_seconds"), (int, float)):
             raise ValueError("Invalid runtime_seconds in log")
 
+    def _validate_segment_data(self, index: int, segment: Dict[str, Any]) -> None:
+        """
+        Validate a single serialized transcript segment.
+
+        Args:
+            index: Position of the segment in the transcript
+            segment: Segment dictionary
+
+        Raises:
+            ValueError: If validation fails
+        """
+        if not isinstance(segment, dict):
+            raise ValueError(f"Segment {index} must be a dictionary")
+
+        # Lookups in required-key order, so the first missing key is the one reported
+        try:
+            start_time = segment["start_time"]
+            end_time = segment["end_time"]
+            segment["text"]
+        except KeyError as e:
+            raise ValueError(f"Segment {index} missing required key: {e.args[0]}") from None
+
+        # Validate timing
+        if not isinstance(start_time, (int, float)) or not isinstance(end_time, (int, float)):
+            raise ValueError(f"Segment {index} has invalid timing values")
+        if start_time >= end_time:
+            raise ValueError(f"Segment {index} start_time >= end_time")
+
     def write_log_only(self, log: TranscriptionLog, output_path: Path) -> Path:
         """
         Write only the transcription log to a file.
@@ -224,8 +262,7 @@ class TranscriptWriter:
                 "successful": log.was_successful
             }
 
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            write_json_file(output_path, log_data)
 
             self.logger.info(f"Successfully wrote transcription log to {output_path}")
             return output_path
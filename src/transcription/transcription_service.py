@@ -5,20 +5,21 @@ Provides the core interface and common functionality for audio transcription
 services, including WhisperX integration and result formatting.
 """
 
-import json
+import asyncio
 import logging
 from abc import ABC
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+import orjson
+
 from .audio_loader import AudioLoader
 from .metadata_parser import MetadataParser
 from .whisper_runner import WhisperRunner
 from .diarization_runner import DiarizationRunner
-from .transcript_writer import TranscriptWriter
-from .async_processor import run_transcription_async
-from ..models.transcript_segment import TranscriptSegment
+from .transcript_writer import TranscriptWriter, segment_to_dict, write_json_file
+from .async_processor import get_async_processor, run_transcription_async
 from ..models.transcription_log import TranscriptionLog
 
 
@@ -31,7 +32,9 @@ class TranscriptionService(ABC):
     """
 
     def __init__(self, model_name: str = "large-v3", enable_diarization: bool = False,
-                 hf_auth_token: Optional[str] = None, min_speakers: int = 1, max_speakers: int = 10):
+                 hf_auth_token: Optional[str] = None, min_speakers: int = 1, max_speakers: int = 10,
+                 batch_size: int = 16, compute_type: Optional[str] = None,
+                 cache_decoded_audio: bool = False):
         """
         Initialize the transcription service.
 
@@ -41,28 +44,47 @@ class TranscriptionService(ABC):
             hf_auth_token: HuggingFace authentication token for pyannote models
             min_speakers: Minimum number of speakers to detect (default: 1)
             max_speakers: Maximum number of speakers to detect (default: 10)
+            batch_size: WhisperX transcription batch size (default: 16)
+            compute_type: CTranslate2 compute type (default: int8_float16 on CUDA 7.5+ or under 8GB VRAM, float16 on other GPUs, int8 on CPU)
+            cache_decoded_audio: Keep memory-mapped decoded audio for files seen before (default: False)
         """
         self.model_name = model_name
         self._diarization_enabled = enable_diarization
         self.hf_auth_token = hf_auth_token
         self.min_speakers = min_speakers
         self.max_speakers = max_speakers
+        self.batch_size = batch_size
+        self.compute_type = compute_type
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # Initialize components
-        self.audio_loader = AudioLoader()
+        self.audio_loader = AudioLoader(cache_decoded=cache_decoded_audio)
         self.metadata_parser = MetadataParser()
-        self.whisper_runner = WhisperRunner(model_name)
-        self.diarization_runner = DiarizationRunner(model_name, hf_auth_token, min_speakers, max_speakers) if enable_diarization else None
+        self.whisper_runner = WhisperRunner(model_name, batch_size, compute_type, audio_loader=self.audio_loader)
+        self.diarization_runner = DiarizationRunner(model_name, hf_auth_token, min_speakers, max_speakers, batch_size,
+                                                    whisper_runner=self.whisper_runner,
+                                                    compute_type=compute_type) if enable_diarization else None
         self.transcript_writer = TranscriptWriter()
 
-    def _create_transcript_result(self, segments: List[TranscriptSegment],
+        # Serialize inference so concurrent requests reuse the warm model instead of contending for it
+        self._inference_lock = asyncio.Lock()
+
+    @property
+    def diarization_enabled(self) -> bool:
+        """Whether speaker diarization is enabled for future transcriptions."""
+        return self._diarization_enabled
+
+    @diarization_enabled.setter
+    def diarization_enabled(self, value: bool) -> None:
+        self._diarization_enabled = value
+
+    def _create_transcript_result(self, segment_dicts: List[Dict[str, Any]],
                                 log: TranscriptionLog) -> Dict[str, Any]:
         """
         Create standardized transcript result dictionary.
 
         Args:
-            segments: List of transcript segments
+            segment_dicts: Segments already converted by segment_to_dict
             log: Transcription log entry
 
         Returns:
@@ -71,34 +93,10 @@ class TranscriptionService(ABC):
         return {
             "transcript_path": None,  # To be set by caller
             "log_path": None,         # To be set by caller
-            "segments": [self._segment_to_dict(segment) for segment in segments],
+            "segments": segment_dicts,
             "log": self._log_to_dict(log)
         }
 
-    def _segment_to_dict(self, segment: TranscriptSegment) -> Dict[str, Any]:
-        """Convert TranscriptSegment to dictionary."""
-        result = {
-            "start_time": segment.start_time,
-            "end_time": segment.end_time,
-            "text": segment.text
-        }
-
-        if segment.speaker_label is not None:
-            result["speaker_label"] = segment.speaker_label
-
-        if segment.words:
-            result["words"] = [
-                {
-                    "word": word.word,
-                    "start": word.start,
-                    "end": word.end,
-                    "confidence": word.confidence
-                }
-                for word in segment.words
-            ]
-
-        return result
-
     def _log_to_dict(self, log: TranscriptionLog) -> Dict[str, Any]:
         """Convert TranscriptionLog to dictionary."""
         return {
@@ -119,8 +117,7 @@ class TranscriptionService(ABC):
         """
         result["transcript_path"] = str(output_path)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        write_json_file(output_path, result)
 
         self.logger.info(f"Transcript saved to {output_path}")
 
@@ -135,8 +132,7 @@ class TranscriptionService(ABC):
         log_data = self._log_to_dict(log)
         log_data["transcript_path"] = str(log_path.parent / "transcript.json")
 
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, indent=2, ensure_ascii=False)
+        write_json_file(log_path, log_data)
 
         self.logger.info(f"Transcription log saved to {log_path}")
 
@@ -176,8 +172,7 @@ class TranscriptionService(ABC):
             return None
 
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return orjson.loads(Path(metadata_path).read_bytes())
         except Exception as e:
             self.logger.error(f"Failed to load metadata from {metadata_path}: {e}")
             return None
@@ -205,30 +200,37 @@ class TranscriptionService(ABC):
             language = "en"
             if metadata and "language" in metadata:
                 language = metadata["language"]
-            # Run transcription in thread pool
-            if self.diarization_enabled and self.diarization_runner:
-                segments, log = await run_transcription_async(
-                    self.diarization_runner.transcribe_with_diarization,
-                    audio_path,
-                    language
-                )
-            else:
-                segments, log = await run_transcription_async(
-                    self.whisper_runner.transcribe_audio,
-                    audio_path,
-                    language
-                )
+            # Run transcription in thread pool (diarization runs its stages concurrently)
+            async with self._inference_lock:
+                if self.diarization_enabled and self.diarization_runner:
+                    segments, log = await self.diarization_runner.transcribe_with_diarization(
+                        audio_path,
+                        language
+                    )
+                else:
+                    segments, log = await run_transcription_async(
+                        self.whisper_runner.transcribe_audio,
+                        audio_path,
+                        language
+                    )
             # Generate output paths
             output_dir = audio_path.parent
             base_name = audio_path.stem
             transcript_path = output_dir / f"{base_name}_transcript.json"
             log_path = output_dir / f"{base_name}_transcription.log"
-            # Write transcript
-            self.transcript_writer.write_transcript(segments, log, transcript_path, session_info)
-            # Write log
-            self.transcript_writer.write_log_only(log, log_path)
+            # Write transcript and log concurrently on the I/O pool, off the event loop
+            processor = get_async_processor()
+            await asyncio.gather(
+                processor.run_io_task(self.transcript_writer.write_transcript,
+                                      segments, log, transcript_path, session_info),
+                processor.run_io_task(self.transcript_writer.write_log_only, log, log_path),
+            )
+            # The result gets its own plain dicts, independent of the writer's serialization form;
+            # only the dict form is returned, so drop the segment objects once converted
+            segment_dicts = list(map(segment_to_dict, segments))
+            del segments
             # Build result
-            result = self._create_transcript_result(segments, log)
+            result = self._create_transcript_result(segment_dicts, log)
             result["transcript_path"] = str(transcript_path)
             result["log_path"] = str(log_path)
             self.logger.info(f"Transcription completed successfully: {transcript_path}")
@@ -268,7 +270,9 @@ class TranscriptionService(ABC):
             # Use provided values or current instance values
             min_spk = min_speakers if min_speakers is not None else self.min_speakers
             max_spk = max_speakers if max_speakers is not None else self.max_speakers
-            self.diarization_runner = DiarizationRunner(self.model_name, self.hf_auth_token, min_spk, max_spk)
+            self.diarization_runner = DiarizationRunner(self.model_name, self.hf_auth_token, min_spk, max_spk, self.batch_size,
+                                                    whisper_runner=self.whisper_runner,
+                                                    compute_type=self.compute_type)
             self.logger.info("Speaker diarization enabled")
             return True
         except Exception as e:
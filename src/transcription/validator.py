@@ -2,8 +2,20 @@
 Transcript JSON Schema Validator
 Validates transcript.json output against required schema for audio transcription.
 """
-import json
-from typing import Any, Dict, List
+import functools
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import orjson
+
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+    fastjsonschema = None
+
 
 class TranscriptValidator:
     REQUIRED_TOP_LEVEL_KEYS = ["metadata", "segments", "log"]
@@ -11,8 +23,44 @@ class TranscriptValidator:
     REQUIRED_SEGMENT_KEYS = ["start_time", "end_time", "text"]
     REQUIRED_LOG_KEYS = ["timestamp", "runtime_seconds", "model_name", "accuracy_metrics", "errors", "successful"]
 
+    # Structural schema; the start_time < end_time cross-field check is done separately
+    SCHEMA = {
+        "type": "object",
+        "required": REQUIRED_TOP_LEVEL_KEYS,
+        "properties": {
+            "metadata": {"type": "object", "required": REQUIRED_METADATA_KEYS},
+            "segments": {
+                "type": "array",
+                "items": {"type": "object", "required": REQUIRED_SEGMENT_KEYS},
+            },
+            "log": {"type": "object", "required": REQUIRED_LOG_KEYS},
+        },
+    }
+
     @staticmethod
     def validate_transcript(transcript: Dict[str, Any]) -> List[str]:
+        """
+        Validate a transcript dictionary.
+
+        Structurally valid transcripts are checked with a precompiled JSON-Schema
+        validator; the key-by-key walk only runs to report errors.
+        """
+        if _compiled_transcript_validator is None:
+            return TranscriptValidator._collect_errors(transcript)
+
+        try:
+            _compiled_transcript_validator(transcript)
+        except fastjsonschema.JsonSchemaException:
+            return TranscriptValidator._collect_errors(transcript)
+
+        return [
+            f"Segment {i} start_time >= end_time"
+            for i, segment in enumerate(transcript["segments"])
+            if segment["start_time"] >= segment["end_time"]
+        ]
+
+    @staticmethod
+    def _collect_errors(transcript: Dict[str, Any]) -> List[str]:
         errors = []
         # Top-level keys
         for key in TranscriptValidator.REQUIRED_TOP_LEVEL_KEYS:
@@ -42,9 +90,24 @@ class TranscriptValidator:
 
     @staticmethod
     def validate_file(path: str) -> List[str]:
+        """Validate a transcript file; unchanged files reuse their previous result."""
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                transcript = json.load(f)
-            return TranscriptValidator.validate_transcript(transcript)
-        except Exception as e:
+            stat = os.stat(path)
+        except OSError as e:
             return [f"Failed to load or parse transcript file: {e}"]
+        return list(TranscriptValidator._validate_file_cached(str(path), stat.st_mtime_ns, stat.st_size))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _validate_file_cached(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+        """Validate a transcript file, cached on (path, modification time, size)."""
+        try:
+            transcript = orjson.loads(Path(path).read_bytes())
+            return tuple(TranscriptValidator.validate_transcript(transcript))
+        except Exception as e:
+            return (f"Failed to load or parse transcript file: {e}",)
+
+
+_compiled_transcript_validator = (
+    fastjsonschema.compile(TranscriptValidator.SCHEMA) if FASTJSONSCHEMA_AVAILABLE else None
+)
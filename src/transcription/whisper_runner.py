@@ -6,17 +6,75 @@ audio processing, alignment, and result formatting.
 """
 
 import logging
+from operator import itemgetter
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from datetime import datetime
 
+try:
+    from whisperx import align as whisperx_align
+    WHISPERX_AVAILABLE = True
+except ImportError:
+    WHISPERX_AVAILABLE = False
+    whisperx_align = None
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+
 from .model_manager import get_model_manager
 from .audio_loader import AudioLoader
 from ..models.transcript_segment import TranscriptSegment, WordAlignment
 from ..models.transcription_log import TranscriptionLog
 
 
+_WORD_FIELDS = itemgetter("word", "start", "end", "confidence")
+
+
+def _word_alignment(word: Dict[str, Any]) -> WordAlignment:
+    """Build a WordAlignment from a WhisperX word entry, defaulting any missing fields."""
+    try:
+        text, start, end, confidence = _WORD_FIELDS(word)
+    except KeyError:
+        # WhisperX omits timing and confidence for words it could not align
+        text, start, end, confidence = (word.get("word", ""), word.get("start", 0.0),
+                                        word.get("end", 0.0), word.get("confidence", 0.0))
+    return WordAlignment(word=text, start=start, end=end, confidence=confidence)
+
+
+def _logprob_confidence_stats(logprobs: np.ndarray) -> Tuple[float, float, float]:
+    """Return (mean, min, max) of the logistic confidences of non-empty log probabilities."""
+    confidences = 1.0 / (1.0 + np.exp(-logprobs))
+    return confidences.mean(), confidences.min(), confidences.max()
+
+
+def _logprob_confidence_stats_loop(logprobs: np.ndarray) -> Tuple[float, float, float]:
+    """Single-pass (mean, min, max) of the logistic confidences; compiled with numba when available."""
+    if logprobs.shape[0] == 0:
+        return np.nan, np.nan, np.nan
+    # Seed from the first element rather than +/-inf so no infinities enter the comparisons
+    c = 1.0 / (1.0 + np.exp(-logprobs[0]))
+    total = c
+    cmin = c
+    cmax = c
+    for i in range(1, logprobs.shape[0]):
+        c = 1.0 / (1.0 + np.exp(-logprobs[i]))
+        total += c
+        if c < cmin:
+            cmin = c
+        elif c > cmax:
+            cmax = c
+    return total / logprobs.shape[0], cmin, cmax
+
+
+if NUMBA_AVAILABLE:
+    _logprob_confidence_stats = njit(cache=True)(_logprob_confidence_stats_loop)
+
+
 class WhisperRunner:
     """
     Runs WhisperX transcription on audio files.
@@ -25,17 +83,25 @@ class WhisperRunner:
     and result processing with proper error handling.
     """
 
-    def __init__(self, model_name: str = "large-v3"):
+    def __init__(self, model_name: str = "large-v3", batch_size: int = 16,
+                 compute_type: Optional[str] = None, audio_loader: Optional[AudioLoader] = None):
         """
         Initialize the WhisperX runner.
 
         Args:
             model_name: WhisperX model to use (default: "large-v3")
+            batch_size: Number of VAD-chunked audio windows decoded per batch (default: 16)
+            compute_type: CTranslate2 compute type (default: int8_float16 on CUDA 7.5+ or under 8GB VRAM, float16 on other GPUs, int8 on CPU)
+            audio_loader: Shared AudioLoader, carrying the decoded-audio cache setting (created if not provided)
         """
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.compute_type = compute_type
         self.logger = logging.getLogger(self.__class__.__name__)
         self.model_manager = get_model_manager()
-        self.audio_loader = AudioLoader()
+        # Start loading the exact model and compute type this runner will request
+        self.model_manager.warm_model(model_name, compute_type)
+        self.audio_loader = audio_loader or AudioLoader()
 
     def transcribe_audio(self, audio_path: Path,
                         language: str = "en") -> Tuple[List[TranscriptSegment], TranscriptionLog]:
@@ -52,27 +118,55 @@ class WhisperRunner:
         Raises:
             RuntimeError: If transcription fails
         """
-        start_time = datetime.now()
+        self.logger.info(f"Starting WhisperX transcription: {audio_path}")
 
         try:
-            self.logger.info(f"Starting WhisperX transcription: {audio_path}")
-
             # Load and validate audio
             audio, sample_rate = self.audio_loader.load_audio(audio_path)
+        except Exception as e:
+            error_msg = f"WhisperX transcription failed: {e}"
+            self.logger.error(error_msg)
+            raise RuntimeError(error_msg) from e
+
+        return self.transcribe_audio_array(audio, sample_rate, language)
+
+    def transcribe_audio_array(self, audio: np.ndarray, sample_rate: int,
+                               language: str = "en") -> Tuple[List[TranscriptSegment], TranscriptionLog]:
+        """
+        Transcribe already-decoded audio using WhisperX.
+
+        Lets callers that also need the samples (e.g. diarization) decode the file once.
+
+        Args:
+            audio: Mono float32 audio array
+            sample_rate: Sample rate of the audio (resampled to 16kHz if different)
+            language: Language code for transcription
+
+        Returns:
+            Tuple of (transcript_segments, transcription_log)
+
+        Raises:
+            RuntimeError: If transcription fails
+        """
+        start_time = datetime.now()
+
+        try:
+            if sample_rate != 16000:
+                audio = self.audio_loader.resample_audio(audio, sample_rate, 16000)
 
             # Load WhisperX model
-            model = self.model_manager.load_model(self.model_name)
+            model = self.model_manager.load_model(self.model_name, self.compute_type)
 
-            # Run transcription
-            self.logger.info("Running WhisperX transcription...")
-            result = model.transcribe(audio, language=language)
+            # Run batched transcription over VAD-chunked audio
+            self.logger.info(f"Running WhisperX transcription (batch_size={self.batch_size})...")
+            result = model.transcribe(audio, batch_size=self.batch_size, language=language)
 
             # Load alignment model for precise timestamps
             align_model, metadata = self.model_manager.load_align_model(language)
 
             # Align transcription results
             self.logger.info("Aligning transcription results...")
-            aligned_result = whisperx.align(
+            aligned_result = whisperx_align(
                 result["segments"],
                 align_model,
                 metadata,
@@ -127,15 +221,7 @@ class WhisperRunner:
             # Extract word alignments if available
             words = None
             if "words" in segment_data:
-                words = [
-                    WordAlignment(
-                        word=word.get("word", ""),
-                        start=word.get("start", 0.0),
-                        end=word.get("end", 0.0),
-                        confidence=word.get("confidence", 0.0)
-                    )
-                    for word in segment_data["words"]
-                ]
+                words = list(map(_word_alignment, segment_data["words"]))
 
             # Create segment
             segment = TranscriptSegment(
@@ -165,33 +251,30 @@ class WhisperRunner:
 
         # Average confidence from raw result
         if "segments" in raw_result:
-            confidences = []
-            for segment in raw_result["segments"]:
-                if "avg_logprob" in segment:
-                    # Convert log probability to confidence (rough approximation)
-                    confidence = 1.0 / (1.0 + np.exp(-segment["avg_logprob"]))
-                    confidences.append(confidence)
-
-            if confidences:
-                metrics["average_confidence"] = float(np.mean(confidences))
-                metrics["min_confidence"] = float(np.min(confidences))
-                metrics["max_confidence"] = float(np.max(confidences))
+            logprobs = np.fromiter(
+                (segment["avg_logprob"] for segment in raw_result["segments"] if "avg_logprob" in segment),
+                dtype=np.float64,
+            )
+
+            if logprobs.size:
+                # Convert log probability to confidence (rough approximation)
+                average, minimum, maximum = _logprob_confidence_stats(logprobs)
+                metrics["average_confidence"] = float(average)
+                metrics["min_confidence"] = float(minimum)
+                metrics["max_confidence"] = float(maximum)
 
         # Word-level metrics from alignment
         if "segments" in aligned_result:
-            total_words = 0
-            total_confidence = 0.0
-
-            for segment in aligned_result["segments"]:
-                if "words" in segment:
-                    for word in segment["words"]:
-                        if "confidence" in word:
-                            total_words += 1
-                            total_confidence += word["confidence"]
+            word_confidences = np.fromiter(
+                (word["confidence"]
+                 for segment in aligned_result["segments"] if "words" in segment
+                 for word in segment["words"] if "confidence" in word),
+                dtype=np.float64,
+            )
 
-            if total_words > 0:
-                metrics["word_level_confidence"] = total_confidence / total_words
-                metrics["total_words"] = total_words
+            if word_confidences.size:
+                metrics["word_level_confidence"] = float(word_confidences.mean())
+                metrics["total_words"] = int(word_confidences.size)
 
         return metrics
 
@@ -203,10 +286,3 @@ class WhisperRunner:
             Dictionary with model information
         """
         return self.model_manager.get_model_info(self.model_name) or {}
-
-
-# Import whisperx here to avoid circular imports
-try:
-    import whisperx
-except ImportError:
-    whisperx = None
\ No newline at end of file
@@ -1,38 +1,135 @@
 import io
+import mmap
+import struct
 import wave
-from typing import Tuple
+from pathlib import Path
+from typing import Tuple, Union
 
+import numpy as np
 import speech_recognition as sr
 
+from src.transcription.audio_loader import AudioLoader
+
+# RIFF/WAVE header with a 16-byte fmt chunk immediately followed by the data chunk
+_CANONICAL_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+WavBuffer = Union[bytes, mmap.mmap]
+
+
+class PCMDownsampler:
+    """
+    Streaming converter from Discord 48kHz stereo 16-bit PCM to 16kHz mono 16-bit PCM.
+
+    Packets are downmixed, low-pass filtered with a windowed-sinc FIR and decimated.
+    Filter history and decimation phase are carried across calls so that packet
+    boundaries do not introduce discontinuities.
+    """
+
+    def __init__(self, input_rate: int = 48000, output_rate: int = 16000,
+                 channels: int = 2, num_taps: int = 63):
+        if input_rate % output_rate:
+            raise ValueError(f"input_rate ({input_rate}) must be a multiple of output_rate ({output_rate})")
+
+        self.factor = input_rate // output_rate
+        self.channels = channels
+
+        # Windowed-sinc low-pass at the output Nyquist frequency
+        cutoff = (output_rate / 2) / input_rate
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(num_taps)
+        self.taps = (taps / taps.sum()).astype(np.float32)
+
+        self._history = np.zeros(num_taps - 1, dtype=np.float32)
+        self._phase = 0
+
+    def process(self, data: bytes) -> bytes:
+        """Convert one packet of interleaved PCM bytes and return the downsampled bytes."""
+        samples = np.frombuffer(data, dtype=np.int16)
+        frames = samples[:len(samples) - len(samples) % self.channels].reshape(-1, self.channels)
+        if frames.size == 0:
+            return b''
+
+        mono = frames.mean(axis=1, dtype=np.float32)
+        padded = np.concatenate((self._history, mono))
+        filtered = np.convolve(padded, self.taps, mode='valid')
+        self._history = padded[-len(self._history):]
+
+        decimated = filtered[self._phase::self.factor]
+        self._phase = (self._phase - len(filtered)) % self.factor
+
+        return np.clip(np.rint(decimated), -32768, 32767).astype('<i2').tobytes()
+
+
+def _pcm_to_float(frames: bytes, sampwidth: int, nchannels: int) -> np.ndarray:
+    """Decode interleaved little-endian PCM frames to mono float32 in [-1, 1)."""
+    if sampwidth == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sampwidth == 2:
+        samples = np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+    elif sampwidth == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        packed = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        samples = np.where(packed >= 1 << 23, packed - (1 << 24), packed).astype(np.float32) / float(1 << 23)
+    elif sampwidth == 4:
+        samples = np.frombuffer(frames, dtype='<i4').astype(np.float32) / float(1 << 31)
+    else:
+        raise ValueError(f"Unsupported sample width: {sampwidth} bytes")
+
+    if nchannels > 1:
+        samples = samples[:len(samples) - len(samples) % nchannels].reshape(-1, nchannels).mean(axis=1)
+    return samples
+
+
 def convert_audio_to_wav(audio_data: sr.AudioData) -> bytes:
     """
     Convert speech recognition AudioData to 16kHz mono 16-bit PCM WAV bytes.
     """
-    # Convert to WAV data
-    wav_data = audio_data.get_wav_data()
+    return _convert_wav_buffer(audio_data.get_wav_data())
+
+
+def convert_audio_to_wav_path(path: Union[str, Path]) -> bytes:
+    """
+    Convert a WAV file to 16kHz mono 16-bit PCM WAV bytes.
+
+    The file is memory-mapped and read by the wave module in place, rather than
+    being read into memory and wrapped in a BytesIO first.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as wav_map:
+        return _convert_wav_buffer(wav_map)
+
+
+def _wav_reader(wav_buffer: WavBuffer):
+    """File-like view of a WAV buffer for the wave module; a memory map already is one."""
+    return wav_buffer if isinstance(wav_buffer, mmap.mmap) else io.BytesIO(wav_buffer)
 
-    # Load into BytesIO for processing
-    wav_io = io.BytesIO(wav_data)
 
+def _convert_wav_buffer(wav_buffer: WavBuffer) -> bytes:
+    """Convert WAV bytes or a memory-mapped WAV file to 16kHz mono 16-bit PCM WAV bytes."""
     # Open as WAV file to check and convert format
-    with wave.open(wav_io, 'rb') as wav_file:
+    with wave.open(_wav_reader(wav_buffer), 'rb') as wav_file:
         # Get current parameters
         nchannels, sampwidth, framerate, nframes, comptype, compname = wav_file.getparams()
 
         # If already 16kHz mono 16-bit, return as is
         if framerate == 16000 and nchannels == 1 and sampwidth == 2:
-            return wav_data
+            return bytes(wav_buffer)
 
         # Read frames
         frames = wav_file.readframes(nframes)
 
+    # Downmix, then resample through AudioLoader (soxr, librosa or scipy, whichever is installed)
+    audio = _pcm_to_float(frames, sampwidth, nchannels)
+    if framerate != 16000:
+        audio = AudioLoader().resample_audio(audio, framerate, 16000)
+    pcm = np.clip(np.rint(audio * 32768.0), -32768, 32767).astype('<i2')
+
     # Create new WAV with desired format
     output_io = io.BytesIO()
     with wave.open(output_io, 'wb') as out_wav:
         out_wav.setnchannels(1)  # Mono
         out_wav.setsampwidth(2)  # 16-bit
         out_wav.setframerate(16000)  # 16kHz
-        out_wav.writeframes(frames)
+        out_wav.writeframesraw(pcm.tobytes())  # header sizes are patched once on close
 
     return output_io.getvalue()
 
@@ -40,15 +137,35 @@ def save_wav_file(wav_bytes: bytes, file_path: str) -> None:
     """
     Save WAV bytes to file.
     """
-    with open(file_path, 'wb') as f:
-        f.write(wav_bytes)
+    Path(file_path).write_bytes(wav_bytes)
 
 def get_audio_duration(wav_bytes: bytes) -> float:
     """
     Get duration of WAV audio in seconds.
     """
-    wav_io = io.BytesIO(wav_bytes)
-    with wave.open(wav_io, 'rb') as wav_file:
+    return _wav_duration(wav_bytes)
+
+
+def get_audio_duration_path(path: Union[str, Path]) -> float:
+    """
+    Get duration of a WAV file in seconds without reading the audio data.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as wav_map:
+        return _wav_duration(wav_map)
+
+
+def _wav_duration(wav_buffer: WavBuffer) -> float:
+    """Duration in seconds of WAV bytes or a memory-mapped WAV file."""
+    # Canonical 44-byte PCM header: read the rate and data size directly
+    if len(wav_buffer) >= _CANONICAL_WAV_HEADER.size:
+        (riff, _, wave_id, fmt_id, fmt_size, _, _, rate, _, block_align, _,
+         data_id, data_size) = _CANONICAL_WAV_HEADER.unpack_from(wav_buffer)
+        if (riff == b'RIFF' and wave_id == b'WAVE' and fmt_id == b'fmt ' and fmt_size == 16
+                and data_id == b'data' and rate and block_align):
+            return (data_size // block_align) / float(rate)
+
+    # Extra chunks (LIST, fact, extensible fmt) need the full chunk walk
+    with wave.open(_wav_reader(wav_buffer), 'rb') as wav_file:
         frames = wav_file.getnframes()
         rate = wav_file.getframerate()
-        return frames / float(rate)
\ No newline at end of file
+        return frames / float(rate)
@@ -0,0 +1,26 @@
+import hashlib
+from pathlib import Path
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Return the hex SHA-256 digest of a file.
+
+    hashlib.file_digest reads and hashes in C through OpenSSL, which uses the
+    CPU's SHA extensions (SHA-NI, ARMv8 crypto) when available.
+    """
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def buffer_sha256(buffer) -> str:
+    """Return the hex SHA-256 digest of a buffer-protocol object (bytes, contiguous ndarray)."""
+    return hashlib.sha256(memoryview(buffer).cast('B')).hexdigest()
@@ -1,8 +1,10 @@
-import json
 import os
 from datetime import datetime
+from pathlib import Path
 from typing import List
 
+import orjson
+
 from src.models.session_metadata import SessionMetadata
 
 def save_metadata(metadata: SessionMetadata, output_dir: str) -> str:
@@ -25,8 +27,7 @@ def save_metadata(metadata: SessionMetadata, output_dir: str) -> str:
         "file_path": metadata.file_path
     }
 
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    Path(file_path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     return file_path
 
@@ -34,8 +35,7 @@ def load_metadata(file_path: str) -> SessionMetadata:
     """
     Load session metadata from JSON file.
     """
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    data = orjson.loads(Path(file_path).read_bytes())
 
     return SessionMetadata(
         guild_id=data["guild_id"],
@@ -1,16 +1,41 @@
 """
 pytest configuration and shared fixtures for transcription testing.
 """
+import importlib.util
+import os
 import pytest
-import json
+import wave
+from collections import namedtuple
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+import orjson
 
 # Test fixtures directory
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 AUDIO_DIR = FIXTURES_DIR / "audio"
 METADATA_DIR = FIXTURES_DIR / "metadata"
 EXPECTED_OUTPUTS_DIR = FIXTURES_DIR / "expected_outputs"
+AUDIO_FIXTURE_NAMES = ("single_speaker_10s.wav", "multi_speaker_30s.wav", "corrupted.wav")
+
+# Session-scoped fixtures are built once per pytest-xdist worker: they return plain dicts,
+# Paths and tuples and must not hold open file handles across tests.
+
+# Manual Discord command tests are always skipped; keep them out of collection unless requested
+collect_ignore_glob = [] if os.environ.get("RUN_MANUAL_TESTS") else ["test_bot_commands.py"]
+
+
+def pytest_configure(config):
+    """Generate missing test audio once before collection when GEN_FIXTURES is set."""
+    # Under pytest-xdist only the controller generates; workers start after it finishes
+    if not os.environ.get("GEN_FIXTURES") or hasattr(config, "workerinput"):
+        return
+    if all((AUDIO_DIR / name).exists() for name in AUDIO_FIXTURE_NAMES):
+        return
+    spec = importlib.util.spec_from_file_location("generate_audio", FIXTURES_DIR / "generate_audio.py")
+    generate_audio = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generate_audio)
+    generate_audio.main()
 
 
 @pytest.fixture
@@ -37,50 +62,72 @@ def expected_outputs_dir() -> Path:
     return EXPECTED_OUTPUTS_DIR
 
 
-@pytest.fixture
-def valid_metadata() -> Dict[str, Any]:
-    """Load valid session metadata fixture."""
-    with open(METADATA_DIR / "valid_metadata.json", 'r', encoding='utf-8') as f:
-        return json.load(f)
+@pytest.fixture(scope="session")
+def valid_metadata_session() -> Dict[str, Any]:
+    """Parse valid session metadata fixture once per test session."""
+    return orjson.loads((METADATA_DIR / "valid_metadata.json").read_bytes())
+
+
+@pytest.fixture(scope="session")
+def single_speaker_expected_session() -> Dict[str, Any]:
+    """Parse expected single speaker transcript once per test session."""
+    return orjson.loads((EXPECTED_OUTPUTS_DIR / "single_speaker_transcript.json").read_bytes())
 
 
 @pytest.fixture
-def single_speaker_expected() -> Dict[str, Any]:
-    """Load expected transcript for single speaker audio."""
-    with open(EXPECTED_OUTPUTS_DIR / "single_speaker_transcript.json", 'r', encoding='utf-8') as f:
-        return json.load(f)
+def valid_metadata(valid_metadata_session: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a private copy of valid session metadata that tests may mutate."""
+    # An orjson round trip copies JSON-shaped data faster than copy.deepcopy
+    return orjson.loads(orjson.dumps(valid_metadata_session))
 
 
 @pytest.fixture
-def single_speaker_audio(audio_dir: Path) -> Path:
-    """Return path to single speaker test audio."""
-    audio_path = audio_dir / "single_speaker_10s.wav"
-    if not audio_path.exists():
-        pytest.skip(f"Test audio not found: {audio_path}")
+def single_speaker_expected(single_speaker_expected_session: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a private copy of the expected single speaker transcript that tests may mutate."""
+    return orjson.loads(orjson.dumps(single_speaker_expected_session))
+
+
+WavHeader = namedtuple("WavHeader", "channels sampwidth framerate nframes")
+
+@pytest.fixture(scope="session")
+def _audio_presence() -> Dict[str, Optional[Path]]:
+    """Check once per session which test audio files exist (None if missing)."""
+    presence = {}
+    for name in AUDIO_FIXTURE_NAMES:
+        audio_path = AUDIO_DIR / name
+        presence[name] = audio_path if audio_path.exists() else None
+    return presence
+
+
+def _require_audio(audio_presence: Dict[str, Optional[Path]], name: str) -> Path:
+    """Return the cached audio path, skipping the test if the file is missing."""
+    audio_path = audio_presence[name]
+    if audio_path is None:
+        pytest.skip(f"Test audio not found: {AUDIO_DIR / name}")
     return audio_path
 
 
 @pytest.fixture
-def multi_speaker_audio(audio_dir: Path) -> Path:
-    """Return path to multi-speaker test audio."""
-    audio_path = audio_dir / "multi_speaker_30s.wav"
-    if not audio_path.exists():
-        pytest.skip(f"Test audio not found: {audio_path}")
-    return audio_path
+def single_speaker_audio(_audio_presence: Dict[str, Optional[Path]]) -> Path:
+    """Return path to single speaker test audio."""
+    return _require_audio(_audio_presence, "single_speaker_10s.wav")
+
+
+@pytest.fixture(scope="session")
+def single_speaker_wav_header(_audio_presence: Dict[str, Optional[Path]]) -> WavHeader:
+    """Read the single speaker audio's WAV header once per session."""
+    audio_path = _require_audio(_audio_presence, "single_speaker_10s.wav")
+    with wave.open(str(audio_path), 'rb') as wav:
+        return WavHeader(wav.getnchannels(), wav.getsampwidth(), wav.getframerate(), wav.getnframes())
 
 
 @pytest.fixture
-def corrupted_audio(audio_dir: Path) -> Path:
-    """Return path to corrupted test audio."""
-    audio_path = audio_dir / "corrupted.wav"
-    if not audio_path.exists():
-        pytest.skip(f"Test audio not found: {audio_path}")
-    return audio_path
+def multi_speaker_audio(_audio_presence: Dict[str, Optional[Path]]) -> Path:
+    """Return path to multi-speaker test audio."""
+    return _require_audio(_audio_presence, "multi_speaker_30s.wav")
 
 
 @pytest.fixture
-def temp_output_dir(tmp_path: Path) -> Path:
-    """Create temporary directory for test outputs."""
-    output_dir = tmp_path / "transcription_output"
-    output_dir.mkdir(exist_ok=True)
-    return output_dir
+def corrupted_audio(_audio_presence: Dict[str, Optional[Path]]) -> Path:
+    """Return path to corrupted test audio."""
+    return _require_audio(_audio_presence, "corrupted.wav")
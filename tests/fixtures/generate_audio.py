@@ -4,11 +4,20 @@ Generate synthetic test audio files for transcription testing.
 This script creates WAV files with synthesized speech for testing purposes.
 Requires pyttsx3 for text-to-speech synthesis (optional).
 """
+import array
+import math
+import sys
 import wave
 import struct
-import math
 from pathlib import Path
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
 
 def generate_silent_audio(output_path: str, duration_seconds: float, sample_rate: int = 16000):
     """
@@ -27,8 +36,7 @@ def generate_silent_audio(output_path: str, duration_seconds: float, sample_rate
         wav.setframerate(sample_rate)
         
         # Write silent frames (all zeros)
-        silent_data = struct.pack('<' + 'h' * num_samples, *[0] * num_samples)
-        wav.writeframes(silent_data)
+        wav.writeframesraw(bytes(num_samples * 2))
     
     print(f"Generated silent audio: {output_path}")
 
@@ -51,14 +59,26 @@ def generate_tone_audio(output_path: str, duration_seconds: float, frequency: fl
         wav.setsampwidth(2)  # 16-bit
         wav.setframerate(sample_rate)
         
-        # Generate sine wave
-        samples = []
-        for i in range(num_samples):
-            value = amplitude * math.sin(2 * math.pi * frequency * i / sample_rate)
-            samples.append(int(value))
+        # A tone at an integer frequency repeats every sample_rate / gcd(sample_rate, frequency)
+        # samples, so only one period is synthesized and then tiled
+        period = num_samples
+        if float(frequency).is_integer():
+            period = min(period, sample_rate // math.gcd(sample_rate, int(frequency)))
+        period = max(period, 1)
         
-        audio_data = struct.pack('<' + 'h' * num_samples, *samples)
-        wav.writeframes(audio_data)
+        if NUMPY_AVAILABLE:
+            # Generate one period in a vectorized pass (astype truncates toward zero like int())
+            t = np.arange(period)
+            one_period = (amplitude * np.sin(2 * np.pi * frequency * t / sample_rate)).astype('<i2')
+            samples = np.resize(one_period, num_samples)
+        else:
+            # Stdlib fallback: fill a compact int16 array without an intermediate list
+            step = 2 * math.pi * frequency / sample_rate
+            one_period = array.array('h', (int(amplitude * math.sin(step * i)) for i in range(period)))
+            samples = (one_period * (num_samples // period + 1))[:num_samples]
+            if sys.byteorder == 'big':
+                samples.byteswap()  # WAV samples are little-endian
+        wav.writeframesraw(samples.tobytes())
     
     print(f"Generated tone audio: {output_path}")
 
@@ -90,23 +110,37 @@ def generate_test_audio_with_tts(output_path: str, text: str, duration_seconds:
         text: Text to synthesize
         duration_seconds: Optional target duration (will pad with silence if needed)
     """
+    generate_tts_batch([(output_path, text, duration_seconds)])
+
+
+def generate_tts_batch(requests):
+    """
+    Generate several TTS audio files with one engine start and a single runAndWait().
+    
+    Args:
+        requests: Iterable of (output_path, text, duration_seconds) tuples
+    """
+    requests = list(requests)
     try:
         import pyttsx3
     except ImportError:
         print("Warning: pyttsx3 not installed. Install with: pip install pyttsx3")
-        print("Falling back to tone generation for:", output_path)
-        generate_tone_audio(output_path, duration_seconds or 10.0)
+        for output_path, _, duration_seconds in requests:
+            print("Falling back to tone generation for:", output_path)
+            generate_tone_audio(output_path, duration_seconds or 10.0)
         return
     
-    # Initialize TTS engine
+    # Initialize TTS engine once for the whole batch
     engine = pyttsx3.init()
     engine.setProperty('rate', 150)  # Speech rate
     
-    # Save to file
-    engine.save_to_file(text, output_path)
+    # Queue every file, then synthesize them all in one pass
+    for output_path, text, _ in requests:
+        engine.save_to_file(text, output_path)
     engine.runAndWait()
     
-    print(f"Generated TTS audio: {output_path}")
+    for output_path, _, _ in requests:
+        print(f"Generated TTS audio: {output_path}")
 
 
 def main():
@@ -124,7 +158,10 @@ def main():
         "The quick brown fox jumps over the lazy dog. "
         "Testing one two three."
     )
-    generate_test_audio_with_tts(str(single_speaker_path), single_speaker_text, 10.0)
+    # Queue all speech fixtures so the TTS engine starts only once
+    generate_tts_batch([
+        (str(single_speaker_path), single_speaker_text, 10.0),
+    ])
     
     # Multi-speaker audio (30 seconds) - Note: TTS can't do multiple voices, use tone instead
     multi_speaker_path = fixtures_dir / "multi_speaker_30s.wav"
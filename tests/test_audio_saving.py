@@ -2,7 +2,6 @@
 Tests for audio saving and file format validation.
 """
 import pytest
-import wave
 from pathlib import Path
 from src.testing.test_helpers import validate_audio_file
 
@@ -28,23 +27,20 @@ class TestAudioFileFormat:
         )
         assert errors == [], f"Audio format validation failed: {errors}"
     
-    def test_audio_is_mono(self, single_speaker_audio):
+    def test_audio_is_mono(self, single_speaker_wav_header):
         """Test that audio is single-channel (mono)."""
-        with wave.open(str(single_speaker_audio), 'rb') as wav:
-            channels = wav.getnchannels()
-            assert channels == 1, f"Expected mono audio, got {channels} channels"
+        channels = single_speaker_wav_header.channels
+        assert channels == 1, f"Expected mono audio, got {channels} channels"
     
-    def test_audio_is_16bit(self, single_speaker_audio):
+    def test_audio_is_16bit(self, single_speaker_wav_header):
         """Test that audio is 16-bit."""
-        with wave.open(str(single_speaker_audio), 'rb') as wav:
-            sample_width = wav.getsampwidth()
-            assert sample_width == 2, f"Expected 16-bit audio, got {sample_width * 8}-bit"
+        sample_width = single_speaker_wav_header.sampwidth
+        assert sample_width == 2, f"Expected 16-bit audio, got {sample_width * 8}-bit"
     
-    def test_audio_sample_rate(self, single_speaker_audio):
+    def test_audio_sample_rate(self, single_speaker_wav_header):
         """Test that audio has correct sample rate."""
-        with wave.open(str(single_speaker_audio), 'rb') as wav:
-            sample_rate = wav.getframerate()
-            assert sample_rate == 16000, f"Expected 16kHz sample rate, got {sample_rate}Hz"
+        sample_rate = single_speaker_wav_header.framerate
+        assert sample_rate == 16000, f"Expected 16kHz sample rate, got {sample_rate}Hz"
 
 
 class TestAudioSaving:
@@ -62,6 +58,15 @@ class TestAudioSaving:
         errors = validate_audio_file(str(corrupted_audio), expected_sample_rate=16000)
         # Corrupted files should fail validation
         assert len(errors) > 0, "Corrupted audio should be detected"
+    
+    def test_non_riff_audio_is_read(self, single_speaker_audio, tmp_path):
+        """Test that formats without a RIFF header are validated through libsndfile."""
+        sf = pytest.importorskip("soundfile")
+        flac_path = tmp_path / "single_speaker_10s.flac"
+        data, sample_rate = sf.read(single_speaker_audio, dtype="int16")
+        sf.write(flac_path, data, sample_rate, subtype="PCM_16")
+        errors = validate_audio_file(str(flac_path), expected_sample_rate=16000, expected_duration=10.0)
+        assert errors == [], f"FLAC validation failed: {errors}"
 
 
 class TestSessionRecording:
@@ -17,40 +17,28 @@ class TestTranscriptSchemaValidation:
         errors = validate_transcript_schema(single_speaker_expected)
         assert errors == [], f"Valid transcript should have no errors: {errors}"
     
-    def test_missing_metadata_fails(self, single_speaker_expected):
-        """Test that missing metadata field is detected."""
-        invalid = single_speaker_expected.copy()
-        del invalid["metadata"]
-        errors = validate_transcript_schema(invalid)
-        assert any("metadata" in e for e in errors)
-    
-    def test_missing_segments_fails(self, single_speaker_expected):
-        """Test that missing segments field is detected."""
-        invalid = single_speaker_expected.copy()
-        del invalid["segments"]
-        errors = validate_transcript_schema(invalid)
-        assert any("segments" in e for e in errors)
-    
-    def test_missing_log_fails(self, single_speaker_expected):
-        """Test that missing log field is detected."""
-        invalid = single_speaker_expected.copy()
-        del invalid["log"]
-        errors = validate_transcript_schema(invalid)
-        assert any("log" in e for e in errors)
-    
-    def test_invalid_segment_timestamps_fails(self, single_speaker_expected):
-        """Test that invalid segment timestamps are detected."""
-        invalid = single_speaker_expected.copy()
-        invalid["segments"][0]["end_time"] = invalid["segments"][0]["start_time"] - 1
-        errors = validate_transcript_schema(invalid)
-        assert any("end_time must be > start_time" in e for e in errors)
+    @pytest.mark.parametrize("bad_time", [float("nan"), float("inf")], ids=["nan", "inf"])
+    def test_non_finite_times_are_rejected(self, single_speaker_expected, bad_time):
+        """Test that NaN or infinite segment times fail validation."""
+        single_speaker_expected["segments"][0]["end_time"] = bad_time
+        errors = validate_transcript_schema(single_speaker_expected)
+        assert errors == ["Segment 0 start_time and end_time must be finite"]
     
-    def test_missing_segment_fields_fails(self, single_speaker_expected):
-        """Test that missing segment fields are detected."""
-        invalid = single_speaker_expected.copy()
-        del invalid["segments"][0]["text"]
-        errors = validate_transcript_schema(invalid)
-        assert any("missing field: text" in e for e in errors)
+    @pytest.mark.parametrize("mutate, expected", [
+        (lambda d: d.pop("metadata"), "metadata"),
+        (lambda d: d.pop("segments"), "segments"),
+        (lambda d: d.pop("log"), "log"),
+        (lambda d: d["segments"][0].update(end_time=d["segments"][0]["start_time"] - 1),
+         "end_time must be > start_time"),
+        (lambda d: d["segments"][0].pop("text"), "missing field: text"),
+    ], ids=["missing_metadata", "missing_segments", "missing_log",
+            "invalid_segment_timestamps", "missing_segment_fields"])
+    def test_invalid_transcript_fails(self, single_speaker_expected, mutate, expected):
+        """Test that each kind of invalid transcript is detected."""
+        # single_speaker_expected is a private deep copy, so it can be mutated in place
+        mutate(single_speaker_expected)
+        errors = validate_transcript_schema(single_speaker_expected)
+        assert any(expected in e for e in errors)
 
 
 class TestMetadataSchemaValidation:
@@ -61,89 +49,56 @@ class TestMetadataSchemaValidation:
         errors = validate_metadata_schema(valid_metadata)
         assert errors == [], f"Valid metadata should have no errors: {errors}"
     
-    def test_missing_guild_id_fails(self, valid_metadata):
-        """Test that missing guild_id is detected."""
-        invalid = valid_metadata.copy()
-        del invalid["guild_id"]
-        errors = validate_metadata_schema(invalid)
-        assert any("guild_id" in e for e in errors)
-    
-    def test_missing_users_fails(self, valid_metadata):
-        """Test that missing users field is detected."""
-        invalid = valid_metadata.copy()
-        del invalid["users"]
-        errors = validate_metadata_schema(invalid)
-        assert any("users" in e for e in errors)
-    
-    def test_invalid_timestamps_fails(self, valid_metadata):
-        """Test that invalid timestamps are detected."""
-        invalid = valid_metadata.copy()
-        invalid["end_time"] = invalid["start_time"] - 1
-        errors = validate_metadata_schema(invalid)
-        assert any("end_time must be > start_time" in e for e in errors)
-    
-    def test_invalid_sample_rate_fails(self, valid_metadata):
-        """Test that invalid sample rate is detected."""
-        invalid = valid_metadata.copy()
-        invalid["sample_rate"] = -1
-        errors = validate_metadata_schema(invalid)
-        assert any("sample_rate" in e for e in errors)
+    @pytest.mark.parametrize("mutate, expected", [
+        (lambda d: d.pop("guild_id"), "guild_id"),
+        (lambda d: d.pop("users"), "users"),
+        (lambda d: d.update(end_time=d["start_time"] - 1), "end_time must be > start_time"),
+        (lambda d: d.update(sample_rate=-1), "sample_rate"),
+    ], ids=["missing_guild_id", "missing_users", "invalid_timestamps", "invalid_sample_rate"])
+    def test_invalid_metadata_fails(self, valid_metadata, mutate, expected):
+        """Test that each kind of invalid metadata is detected."""
+        mutate(valid_metadata)
+        errors = validate_metadata_schema(valid_metadata)
+        assert any(expected in e for e in errors)
+
+
+@pytest.fixture
+def valid_log_entry():
+    """Return a valid transcription log entry that tests may mutate."""
+    return {
+        "date": "2024-01-15",
+        "begin": 1705334400.0,
+        "end": 1705334410.0,
+        "user_id": "123456789",
+        "player": "Alice",
+        "character": "Elara",
+        "event_source": "transcription",
+        "data": {"text": "Hello world"}
+    }
+
+
+def _keep_only_date_and_begin(entry):
+    """Strip a log entry down to its date and begin fields."""
+    for field in list(entry):
+        if field not in ("date", "begin"):
+            del entry[field]
 
 
 class TestLogEntryValidation:
     """Test transcription log entry schema validation."""
     
-    def test_valid_log_entry_passes(self):
+    def test_valid_log_entry_passes(self, valid_log_entry):
         """Test that a valid log entry passes validation."""
-        log_entry = {
-            "date": "2024-01-15",
-            "begin": 1705334400.0,
-            "end": 1705334410.0,
-            "user_id": "123456789",
-            "player": "Alice",
-            "character": "Elara",
-            "event_source": "transcription",
-            "data": {"text": "Hello world"}
-        }
-        errors = validate_log_entry(log_entry)
+        errors = validate_log_entry(valid_log_entry)
         assert errors == []
     
-    def test_missing_required_fields_fails(self):
-        """Test that missing required fields are detected."""
-        incomplete = {
-            "date": "2024-01-15",
-            "begin": 1705334400.0
-        }
-        errors = validate_log_entry(incomplete)
-        assert len(errors) > 0
-        assert any("end" in e for e in errors)
-    
-    def test_invalid_timestamps_fails(self):
-        """Test that invalid timestamps are detected."""
-        invalid = {
-            "date": "2024-01-15",
-            "begin": 1705334410.0,
-            "end": 1705334400.0,
-            "user_id": "123456789",
-            "player": "Alice",
-            "character": "Elara",
-            "event_source": "transcription",
-            "data": {"text": "Hello"}
-        }
-        errors = validate_log_entry(invalid)
-        assert any("timestamp" in e.lower() for e in errors)
-    
-    def test_missing_data_text_fails(self):
-        """Test that missing text in data is detected."""
-        invalid = {
-            "date": "2024-01-15",
-            "begin": 1705334400.0,
-            "end": 1705334410.0,
-            "user_id": "123456789",
-            "player": "Alice",
-            "character": "Elara",
-            "event_source": "transcription",
-            "data": {}
-        }
-        errors = validate_log_entry(invalid)
-        assert any("text" in e for e in errors)
+    @pytest.mark.parametrize("mutate, expected", [
+        (_keep_only_date_and_begin, "end"),
+        (lambda d: d.update(begin=d["end"], end=d["begin"]), "timestamp"),
+        (lambda d: d.update(data={}), "text"),
+    ], ids=["missing_required_fields", "invalid_timestamps", "missing_data_text"])
+    def test_invalid_log_entry_fails(self, valid_log_entry, mutate, expected):
+        """Test that each kind of invalid log entry is detected."""
+        mutate(valid_log_entry)
+        errors = validate_log_entry(valid_log_entry)
+        assert any(expected in e.lower() for e in errors)
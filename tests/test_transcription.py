@@ -2,27 +2,38 @@
 Tests for audio transcription functionality.
 """
 import pytest
-import json
+import asyncio
+import orjson
+import os
+import numpy as np
 from pathlib import Path
 from src.testing.test_helpers import compare_transcripts, calculate_word_error_rate
-from src.transcription.transcription_service import TranscriptionService
-from src.transcription.model_manager import ModelManager
+from src.transcription.audio_loader import AudioLoader, SOUNDFILE_AVAILABLE
+from src.transcription.diarization_service import DiarizationService
+from src.transcription.metadata_parser import MetadataParser
+from src.transcription.validator import TranscriptValidator
+from src.models.transcript_segment import TranscriptSegment, WordAlignment
+from src.transcription.transcript_writer import segment_to_dict
+from src.transcription.task_queue import TranscriptionTaskQueue
+from src.utils.hashing import file_sha256
 
 
 class TestTranscriptionAccuracy:
     """Test transcription accuracy and quality."""
     
     @pytest.mark.skip(reason="Requires Whisper model - integration test only")
-    def test_single_speaker_transcription(self, single_speaker_audio, single_speaker_expected, temp_output_dir):
+    def test_single_speaker_transcription(self, single_speaker_audio, single_speaker_expected, tmp_path):
         """
         Integration test: Transcribe single speaker audio and compare with expected output.
         
         This test requires Whisper model to be available.
         """
+        from src.transcription.transcription_service import TranscriptionService
+        from src.transcription.model_manager import ModelManager
         # Initialize transcription service
         service = TranscriptionService(
             model_manager=ModelManager(model_name="base"),
-            output_dir=str(temp_output_dir)
+            output_dir=str(tmp_path)
         )
         
         # Transcribe audio
@@ -33,13 +44,15 @@ class TestTranscriptionAccuracy:
         assert len(differences) == 0, f"Transcription differences: {differences}"
     
     @pytest.mark.skip(reason="Requires Whisper model - integration test only")
-    def test_multi_speaker_transcription(self, multi_speaker_audio, temp_output_dir):
+    def test_multi_speaker_transcription(self, multi_speaker_audio, tmp_path):
         """
         Integration test: Transcribe multi-speaker audio and verify speaker labels.
         """
+        from src.transcription.transcription_service import TranscriptionService
+        from src.transcription.model_manager import ModelManager
         service = TranscriptionService(
             model_manager=ModelManager(model_name="base"),
-            output_dir=str(temp_output_dir),
+            output_dir=str(tmp_path),
             enable_diarization=True
         )
         
@@ -78,17 +91,19 @@ class TestTranscriptionEdgeCases:
     """Test transcription edge cases and error handling."""
     
     @pytest.mark.skip(reason="Requires Whisper model - integration test only")
-    def test_empty_audio_handling(self, temp_output_dir):
+    def test_empty_audio_handling(self, tmp_path):
         """Test handling of silent/empty audio."""
         # This would require generating a silent audio file
         pass
     
     @pytest.mark.skip(reason="Requires Whisper model - integration test only")
-    def test_corrupted_audio_handling(self, corrupted_audio, temp_output_dir):
+    def test_corrupted_audio_handling(self, corrupted_audio, tmp_path):
         """Test graceful handling of corrupted audio files."""
+        from src.transcription.transcription_service import TranscriptionService
+        from src.transcription.model_manager import ModelManager
         service = TranscriptionService(
             model_manager=ModelManager(model_name="base"),
-            output_dir=str(temp_output_dir)
+            output_dir=str(tmp_path)
         )
         
         # Should handle error gracefully, not crash
@@ -99,13 +114,231 @@ class TestTranscriptionEdgeCases:
         assert "audio" in str(exc_info.value).lower() or "file" in str(exc_info.value).lower()
     
     @pytest.mark.skip(reason="Requires Whisper model - integration test only")
-    def test_very_short_audio_handling(self, temp_output_dir):
+    def test_very_short_audio_handling(self, tmp_path):
         """Test handling of very short audio (< 0.1s)."""
         # Whisper requires minimum 0.1s audio
         # This would require generating a very short audio file
         pass
 
 
+class TestAudioLoader:
+    """Test audio loading without the transcription models."""
+
+    @pytest.mark.skipif(not SOUNDFILE_AVAILABLE, reason="Requires soundfile")
+    def test_audio_info_reads_header(self, single_speaker_audio):
+        """Test that audio info comes from the file header."""
+        info = AudioLoader().get_audio_info(single_speaker_audio)
+
+        assert info["duration_seconds"] == pytest.approx(10.0, abs=0.1)
+        assert info["sample_rate"] == 16000
+        assert info["channels"] == 1
+
+    @pytest.mark.skipif(not SOUNDFILE_AVAILABLE, reason="Requires soundfile")
+    def test_decoded_audio_is_cached(self, single_speaker_audio, tmp_path):
+        """Test that a second load memory-maps the decoded .npy from the cache directory."""
+        loader = AudioLoader(cache_decoded=True, cache_dir=tmp_path / "cache")
+
+        audio, sample_rate = loader.load_audio(single_speaker_audio)
+        copy_path = tmp_path / "renamed.wav"
+        copy_path.write_bytes(single_speaker_audio.read_bytes())
+        cached, cached_rate = loader.load_audio(copy_path)
+        other_quality, _ = loader.load_audio(single_speaker_audio, quality="VHQ")
+
+        digest = file_sha256(single_speaker_audio)
+        assert sorted(path.name for path in (tmp_path / "cache").iterdir()) == [
+            f"{digest}.16000.HQ.f32.npy", f"{digest}.16000.VHQ.f32.npy"
+        ]
+        assert not isinstance(other_quality, np.memmap)
+        assert isinstance(cached, np.memmap)
+        assert cached_rate == sample_rate
+        assert np.array_equal(audio, cached)
+
+    @pytest.mark.skipif(not SOUNDFILE_AVAILABLE, reason="Requires soundfile")
+    def test_audio_cache_is_opt_in(self, single_speaker_audio, tmp_path):
+        """Test that a default loader never writes decoded audio to disk."""
+        loader = AudioLoader(cache_dir=tmp_path / "cache")
+        loader.load_audio(single_speaker_audio)
+
+        assert not (tmp_path / "cache").exists()
+
+    @pytest.mark.skipif(not SOUNDFILE_AVAILABLE, reason="Requires soundfile")
+    def test_audio_cache_evicts_least_recently_used(self, single_speaker_audio, multi_speaker_audio, tmp_path):
+        """Test that the decoded-audio cache stays within its size budget."""
+        loader = AudioLoader(cache_decoded=True, cache_dir=tmp_path / "cache", cache_max_bytes=1)
+        loader.load_audio(single_speaker_audio)
+        loader.load_audio(multi_speaker_audio)
+
+        cached = list((tmp_path / "cache").glob("*.f32.npy"))
+        assert [path.name.split(".")[0] for path in cached] == [file_sha256(multi_speaker_audio)]
+
+
+class TestDiarizationPreCheck:
+    """Test the VAD pre-check that skips the diarization pipeline."""
+
+    @staticmethod
+    def _tone(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    def test_precheck_is_off_by_default(self):
+        """Test that the VAD shortcut never skips diarization unless enabled."""
+        service = DiarizationService(auth_token="unused", max_speakers=4)
+        audio = np.concatenate([np.zeros(8000, np.float32), self._tone(2.0), np.zeros(8000, np.float32)])
+
+        assert not service.is_single_speaker(audio, 16000)
+
+    def test_single_burst_is_single_speaker(self):
+        """Test that one continuous burst of speech skips diarization."""
+        service = DiarizationService(auth_token="unused", max_speakers=4, vad_precheck=True)
+        audio = np.concatenate([np.zeros(8000, np.float32), self._tone(2.0), np.zeros(8000, np.float32)])
+
+        assert service.is_single_speaker(audio, 16000)
+
+    def test_separated_bursts_need_diarization(self):
+        """Test that bursts separated by silence keep diarization enabled."""
+        service = DiarizationService(auth_token="unused", max_speakers=4, vad_precheck=True)
+        audio = np.concatenate([self._tone(1.0), np.zeros(16000, np.float32), self._tone(1.0)])
+
+        assert not service.is_single_speaker(audio, 16000)
+
+    def test_background_noise_does_not_merge_bursts(self):
+        """Test that pauses are still found above steady background noise."""
+        service = DiarizationService(auth_token="unused", max_speakers=4, vad_precheck=True)
+        audio = np.concatenate([self._tone(1.0), np.zeros(16000, np.float32), self._tone(1.0)])
+        audio += 0.05 * np.random.default_rng(0).standard_normal(len(audio)).astype(np.float32)
+
+        assert not service.is_single_speaker(audio, 16000)
+
+    @pytest.mark.skipif(not SOUNDFILE_AVAILABLE, reason="Requires soundfile")
+    def test_shortcut_result_is_not_cached(self, tmp_path):
+        """Test that a VAD shortcut result never reaches the diarization cache."""
+        import soundfile as sf
+
+        audio_path = tmp_path / "single_burst.wav"
+        audio = np.concatenate([np.zeros(8000, np.float32), self._tone(2.0), np.zeros(8000, np.float32)])
+        sf.write(audio_path, audio, 16000, subtype="PCM_16")
+        service = DiarizationService(auth_token="unused", max_speakers=4, cache_dir=tmp_path / "cache",
+                                     vad_precheck=True)
+        service.pipeline = object()  # Never called: the shortcut returns before the pipeline
+
+        result = service.diarize_audio(audio_path)
+
+        assert [seg["speaker"] for seg in result["segments"]] == ["SPEAKER_00"]
+        assert not (tmp_path / "cache").exists()
+
+    def test_single_configured_speaker_skips_diarization(self):
+        """Test that max_speakers=1 always skips diarization."""
+        service = DiarizationService(auth_token="unused", max_speakers=1)
+        audio = np.concatenate([self._tone(1.0), np.zeros(16000, np.float32), self._tone(1.0)])
+
+        assert service.is_single_speaker(audio, 16000)
+
+
+class TestSpeakerAssignment:
+    """Test assigning diarization turns to transcript segments."""
+
+    def test_segments_get_speaker_with_most_overlap(self):
+        """Test that each segment takes the speaker with the largest total overlap."""
+        service = DiarizationService(auth_token="unused")
+        segments = [
+            TranscriptSegment(start_time=0.0, end_time=2.0, text="hello"),
+            TranscriptSegment(start_time=2.5, end_time=6.0, text="there"),
+            TranscriptSegment(start_time=20.0, end_time=21.0, text="silence"),
+        ]
+        turns = {"segments": [
+            {"start": 0.0, "end": 3.0, "speaker": "SPEAKER_01"},
+            {"start": 2.8, "end": 4.0, "speaker": "SPEAKER_00"},
+            {"start": 4.5, "end": 10.0, "speaker": "SPEAKER_00"},
+        ]}
+
+        labelled = service.assign_speakers_to_segments(segments, turns)
+
+        assert [seg.speaker_label for seg in labelled] == ["SPEAKER_01", "SPEAKER_00", None]
+        assert all(seg.speaker_label is None for seg in segments)
+
+
+class TestConfidenceStats:
+    """Test the log-probability confidence statistics used in accuracy metrics."""
+
+    def test_single_pass_stats_match_numpy(self):
+        """Test that the single-pass (numba-compiled when available) loop matches NumPy."""
+        from src.transcription.whisper_runner import _logprob_confidence_stats, _logprob_confidence_stats_loop
+        logprobs = np.array([-0.2, -1.5, -0.05, -3.0, -0.7])
+        confidences = 1.0 / (1.0 + np.exp(-logprobs))
+        expected = (confidences.mean(), confidences.min(), confidences.max())
+
+        assert np.allclose(_logprob_confidence_stats(logprobs), expected)
+        assert np.allclose(_logprob_confidence_stats_loop(logprobs), expected)
+        assert np.allclose(_logprob_confidence_stats_loop(logprobs[:1]), [confidences[0]] * 3)
+
+
+class TestSegmentConversion:
+    """Test converting transcript segments to dictionaries."""
+
+    def test_segment_dict_is_plain_json(self):
+        """Test that word alignments come back as plain dictionaries."""
+        segment = TranscriptSegment(start_time=0.0, end_time=1.0, text="hello",
+                                    words=[WordAlignment(word="hello", start=0.1, end=0.6, confidence=0.9)])
+
+        segment_dict = segment_to_dict(segment)
+
+        assert segment_dict["words"] == [{"word": "hello", "start": 0.1, "end": 0.6, "confidence": 0.9}]
+        assert segment.words[0].word == "hello"
+
+
+class TestMetadataParser:
+    """Test session metadata loading and validation."""
+
+    def test_incomplete_metadata_warns_instead_of_failing(self, tmp_path, caplog):
+        """Test that complete metadata loads quietly and missing or malformed fields only warn."""
+        complete = {
+            "guild_id": 1, "channel_id": 2, "participants": [],
+            "start_time": "2024-01-01T20:00:00.123456", "end_time": "2024-01-01T21:30:00",
+            "duration": 5400.0, "file_path": "session.wav",
+        }
+        complete_path = tmp_path / "complete.json"
+        complete_path.write_bytes(orjson.dumps(complete))
+        partial_path = tmp_path / "partial.json"
+        partial_path.write_bytes(orjson.dumps({"session_id": "s2", "start_time": "yesterday"}))
+        parser = MetadataParser()
+
+        with caplog.at_level("WARNING"):
+            assert parser.load_metadata(complete_path) == complete
+        assert not caplog.records
+
+        with caplog.at_level("WARNING"):
+            assert parser.load_metadata(partial_path)["session_id"] == "s2"
+        messages = [record.getMessage() for record in caplog.records]
+        assert any("missing recommended fields" in message for message in messages)
+        assert any("Invalid timestamp format for start_time" in message for message in messages)
+
+
+class TestTranscriptValidator:
+    """Test transcript.json schema validation."""
+
+    def test_validator_reports_timing_and_missing_keys(self, tmp_path):
+        """Test that structural and timing errors are reported, and rewritten files are revalidated."""
+        transcript = {
+            "metadata": {key: 0 for key in TranscriptValidator.REQUIRED_METADATA_KEYS},
+            "segments": [
+                {"start_time": 0.0, "end_time": 1.0, "text": "hello"},
+                {"start_time": 3.0, "end_time": 2.0, "text": "backwards"},
+            ],
+            "log": {key: 0 for key in TranscriptValidator.REQUIRED_LOG_KEYS},
+        }
+        assert TranscriptValidator.validate_transcript(transcript) == ["Segment 1 start_time >= end_time"]
+
+        path = tmp_path / "transcript.json"
+        path.write_bytes(orjson.dumps(transcript))
+        assert TranscriptValidator.validate_file(str(path)) == ["Segment 1 start_time >= end_time"]
+
+        del transcript["segments"][1]["text"]
+        transcript["segments"][1]["end_time"] = 4.0
+        path.write_bytes(orjson.dumps(transcript))
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert TranscriptValidator.validate_file(str(path)) == ["Segment 1 missing key: text"]
+
+
 class TestAsyncTranscription:
     """Test asynchronous transcription processing."""
     
@@ -133,3 +366,31 @@ class TestAsyncTranscription:
         - Each job produces correct output
         """
         pass
+    
+    def test_task_queue_runs_queued_jobs_shortest_first(self, tmp_path):
+        """Test that the shared worker drains queued jobs shortest audio first."""
+        long_audio = tmp_path / "long.wav"
+        long_audio.write_bytes(b"\x00" * 4000)
+        short_audio = tmp_path / "short.wav"
+        short_audio.write_bytes(b"\x00" * 1000)
+        
+        class FakeService:
+            def __init__(self):
+                self.calls = []
+            
+            async def transcribe_audio(self, audio_path, metadata_path=None):
+                self.calls.append(audio_path)
+                return {"transcript_path": str(audio_path)}
+        
+        async def run():
+            service = FakeService()
+            queue = TranscriptionTaskQueue(service)
+            long_future = await queue.submit("long", long_audio)
+            short_future = await queue.submit("short", short_audio)
+            results = await asyncio.gather(long_future, short_future)
+            await queue.stop()
+            return service.calls, results
+        
+        calls, results = asyncio.run(run())
+        assert calls == [short_audio, long_audio]
+        assert results[0]["transcript_path"] == str(long_audio)